@@ -0,0 +1,132 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, connections
+from django.db.models import Sum
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+from django.utils import timezone
+
+from app.cart.models import Cart, CartItem, StockReservation
+from app.cart.reservations import reserve_cart, sweep_expired
+from app.product.models import Category, Product
+from app.product.stock import OutOfStock
+from app.user.models import User
+
+
+class Command(BaseCommand):
+    help = ('Reserve one hot product from many threads at once in a '
+            'separate test database and check that the stock is never '
+            'oversold. On SQLite the test database is a WAL file, so '
+            'the threads use real connections')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--attempts', type=int, default=20,
+                            help='Number of reservations per thread')
+        parser.add_argument('--stock', type=int, default=100)
+        parser.add_argument('--quantity', type=int, default=1,
+                            help='Quantity of one reservation')
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_name = connection.settings_dict['NAME']
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        if connection.vendor == 'sqlite' and not test_settings.get('NAME'):
+            # An in-memory database can not be shared by threads in WAL
+            test_settings['NAME'] = os.path.join(tempfile.gettempdir(),
+                                                 'stress_reservations.db')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            result = self.run_stress(options)
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{result["reserved"]} reserved, {result["out_of_stock"]} out '
+            f'of stock, {result["errors"]} errors in {result["seconds"]:.2f}'
+            f' s, {result["rate"]:.0f} reservations/s')
+        self.stdout.write(
+            f'Stock {result["stock"]} + reserved {result["held"]} of '
+            f'{options["stock"]}, after sweep {result["swept_stock"]}')
+
+        if result['problems']:
+            raise CommandError('; '.join(result['problems']))
+        self.stdout.write(self.style.SUCCESS('Stock is not oversold'))
+
+    def run_stress(self, options):
+        threads, attempts = options['threads'], options['attempts']
+        quantity = options['quantity']
+
+        user = User.objects.create(email='stress@example.com',
+                                   phone='+10000000000', name='Stress',
+                                   surname='Test')
+        category = Category.objects.create(name='Stress')
+        product = Product.objects.create(name='Hot product',
+                                         category=category, price=10,
+                                         image1='', stock=options['stock'])
+        carts = Cart.objects.bulk_create([
+            Cart(name=f'Stress {index}', owner=user)
+            for index in range(threads * attempts)
+        ])
+        items = CartItem.objects.bulk_create([
+            CartItem(cart=cart, product=product, quantity=quantity)
+            for cart in carts
+        ])
+
+        def run(thread):
+            counts = {'reserved': 0, 'out_of_stock': 0, 'errors': 0}
+            try:
+                for index in range(thread * attempts,
+                                   (thread + 1) * attempts):
+                    try:
+                        reserve_cart(carts[index], [items[index]], user.pk)
+                        counts['reserved'] += 1
+                    except OutOfStock:
+                        counts['out_of_stock'] += 1
+                    except DatabaseError:
+                        counts['errors'] += 1
+            finally:
+                connections.close_all()
+            return counts
+
+        # Connections are per thread, the main one must not hold a lock
+        connections.close_all()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            results = list(executor.map(run, range(threads)))
+        seconds = time.perf_counter() - start
+
+        result = {key: sum(counts[key] for counts in results)
+                  for key in ('reserved', 'out_of_stock', 'errors')}
+        stock = Product.objects.values_list('stock', flat=True).get(
+            pk=product.pk)
+        held = StockReservation.objects.aggregate(
+            held=Sum('quantity', default=0))['held']
+
+        sweep_expired(now=timezone.now() + timedelta(days=1))
+        swept_stock = Product.objects.values_list('stock', flat=True).get(
+            pk=product.pk)
+
+        problems = []
+        if stock + held != options['stock']:
+            problems.append(f'stock {stock} + reserved {held} is not '
+                            f'{options["stock"]}')
+        if held != result['reserved'] * quantity:
+            problems.append(f'{held} is held by {result["reserved"]} '
+                            f'reservations')
+        if result['out_of_stock'] and stock >= quantity:
+            problems.append(f'reservations failed with {stock} in stock')
+        if swept_stock != options['stock']:
+            problems.append(f'stock {swept_stock} after sweep')
+
+        result.update(seconds=seconds, rate=result['reserved'] / seconds,
+                      stock=stock, held=held, swept_stock=swept_stock,
+                      problems=problems)
+        return result
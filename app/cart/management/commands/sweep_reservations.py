@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app.cart.reservations import sweep_expired
+
+
+class Command(BaseCommand):
+    help = ('Delete expired stock reservations in batches and return '
+            'their quantities to the stock, run it periodically')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of reservations in one DELETE')
+
+    def handle(self, *args, **options):
+        released = sweep_expired(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Released {released} expired reservations'))
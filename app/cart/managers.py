@@ -0,0 +1,26 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+
+class CartItemManager(models.Manager):
+    """
+    Manager for cart items. Quantities are changed with a single
+    UPDATE ... SET quantity = quantity + n, so concurrent additions to the
+    same cart never read and write back the row
+
+    Methods:
+        add(): Adds a quantity of the product to the cart
+    """
+
+    def add(self, cart, product, quantity, user_id=None):
+        items = self.filter(cart=cart, product=product)
+        if items.update(quantity=F('quantity') + quantity):
+            return
+
+        try:
+            with transaction.atomic():
+                self.create(cart=cart, product=product,
+                            quantity=quantity, added_by_id=user_id)
+        except IntegrityError:
+            # Another member has added the same product just now
+            items.update(quantity=F('quantity') + quantity)
@@ -0,0 +1,125 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+
+from app.cart.managers import CartItemManager
+from app.common.models import BaseModel
+from app.product.models import Product
+
+
+class Cart(BaseModel):
+    """
+    Group shopping cart
+
+    Fields:
+        name (str): Cart name
+        owner (ForeignKey): User who created the cart
+        members (ManyToManyField): Users who can add items to the cart
+        created_at (DateTimeField): Cart creation date
+
+    Methods:
+        get_total(): Returned the final price of all items in one query
+        __str__(): Returned cart name
+    """
+
+    name = models.CharField(max_length=100)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL,
+                              on_delete=models.CASCADE,
+                              related_name='own_carts')
+    members = models.ManyToManyField(settings.AUTH_USER_MODEL,
+                                     through='CartMember',
+                                     related_name='carts')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def get_total(self):
+        total = self.items.aggregate(total=Sum(ExpressionWrapper(
+            F('quantity') * F('product__final_price'),
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        ), default=0))['total']
+        return Decimal(total).quantize(Decimal('0.01'))
+
+    def __str__(self):
+        return self.name
+
+
+class CartMember(models.Model):
+    """
+    Member of a group cart
+
+    Fields:
+        cart (ForeignKey): Cart
+        user (ForeignKey): Member
+        joined_at (DateTimeField): Date when the user joined the cart
+    """
+
+    cart = models.ForeignKey(Cart,
+                             on_delete=models.CASCADE,
+                             related_name='memberships')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE,
+                             related_name='cart_memberships')
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['cart', 'user']
+
+
+class CartItem(models.Model):
+    """
+    Product in a group cart. There is one row per product, quantities
+    added by different members are summed
+
+    Fields:
+        cart (ForeignKey): Cart
+        product (ForeignKey): Product
+        quantity (int): Quantity of the product
+        added_by (ForeignKey): Member who added the product first
+    """
+
+    cart = models.ForeignKey(Cart,
+                             on_delete=models.CASCADE,
+                             related_name='items')
+    product = models.ForeignKey(Product,
+                                on_delete=models.CASCADE,
+                                related_name='cart_items')
+    quantity = models.PositiveIntegerField(default=1)
+    added_by = models.ForeignKey(settings.AUTH_USER_MODEL,
+                                 on_delete=models.SET_NULL,
+                                 null=True,
+                                 related_name='+')
+
+    objects = CartItemManager()
+
+    class Meta:
+        unique_together = ['cart', 'product']
+
+
+class StockReservation(models.Model):
+    """
+    Quantity of a product taken from the stock for the checkout of a cart.
+    Reservations which are not checked out before expires_at are deleted
+    and returned to the stock by the sweep_reservations command
+
+    Fields:
+        cart (ForeignKey): Cart
+        product (ForeignKey): Product
+        user (ForeignKey): User who reserved the product
+        quantity (int): Reserved quantity
+        created_at (DateTimeField): Reservation date
+        expires_at (DateTimeField): Date when the reservation expires
+    """
+
+    cart = models.ForeignKey(Cart,
+                             on_delete=models.CASCADE,
+                             related_name='reservations')
+    product = models.ForeignKey(Product,
+                                on_delete=models.CASCADE,
+                                related_name='reservations')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE,
+                             related_name='stock_reservations')
+    quantity = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
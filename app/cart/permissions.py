@@ -0,0 +1,19 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsCartMember(BasePermission):
+    """
+    Access to the cart for its members. The cart must be annotated with
+    is_member, so the check does not need a query
+    """
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
+    def has_object_permission(self, request, view, obj):
+        return obj.is_member
+
+
+class IsCartOwner(IsCartMember):
+    def has_object_permission(self, request, view, obj):
+        return obj.owner_id == request.user.pk
@@ -0,0 +1,95 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from app.cart.models import StockReservation
+from app.product.stock import return_stock, take_stock
+
+
+def lock_reservations(reservations, skip_locked=False):
+    """
+    Locks the reservations and deletes them. Returned the number of
+    deleted reservations and their quantities by products. Must be called
+    inside a transaction
+    """
+    rows = list(reservations.select_for_update(skip_locked=skip_locked)
+                .values_list('pk', 'product_id', 'quantity'))
+    quantities = Counter()
+    for _, product_id, quantity in rows:
+        quantities[product_id] += quantity
+    if rows:
+        # The rows are locked, so a concurrent release or checkout can
+        # not delete them and return the stock twice
+        StockReservation.objects.filter(
+            pk__in=[pk for pk, _, _ in rows]).delete()
+    return len(rows), quantities
+
+
+def release(reservations, skip_locked=False):
+    """
+    Deletes the reservations and returns their quantities to the stock
+    with one UPDATE. Returned the number of deleted reservations. With
+    skip_locked rows locked by another transaction are left for it
+    """
+    with transaction.atomic():
+        deleted, quantities = lock_reservations(reservations, skip_locked)
+        return_stock(quantities)
+        return deleted
+
+
+def consume(cart, quantities):
+    """
+    Takes {product_id: quantity} from the stock for the checkout of the
+    cart. Reservations of the cart are deleted, their quantities are
+    already taken, so only the difference is taken or returned. Raises
+    OutOfStock when some product is missing
+    """
+    with transaction.atomic():
+        _, reserved = lock_reservations(cart.reservations.all())
+        return_stock(reserved - Counter(quantities))
+        take_stock(Counter(quantities) - reserved)
+
+
+def reserve_cart(cart, items, user_id, ttl=None):
+    """
+    Reserves the items of the cart for the user. Earlier reservations of
+    the cart are released first, so reserving again renews them with the
+    current quantities. Raises OutOfStock and reserves nothing when some
+    product is missing. Returned created reservations
+    """
+    ttl = settings.STOCK_RESERVATION_TTL if ttl is None else ttl
+    expires_at = timezone.now() + timedelta(seconds=ttl)
+
+    quantities = Counter()
+    for item in items:
+        quantities[item.product_id] += item.quantity
+
+    with transaction.atomic():
+        release(cart.reservations.all())
+        take_stock(quantities)
+        return StockReservation.objects.bulk_create([
+            StockReservation(cart=cart, product=item.product,
+                             user_id=user_id, quantity=item.quantity,
+                             expires_at=expires_at)
+            for item in items
+        ])
+
+
+def sweep_expired(batch_size=1000, now=None):
+    """
+    Releases expired reservations by batches, every batch is one
+    transaction with one DELETE and one UPDATE of the stock. Returned the
+    number of released reservations
+    """
+    now = now or timezone.now()
+    released = 0
+    while True:
+        expired = (StockReservation.objects.filter(expires_at__lte=now)
+                   .order_by('expires_at')[:batch_size])
+        count = release(expired, skip_locked=True)
+        if not count:
+            return released
+        released += count
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+from app.common.serializers import TimedSerializer
+from app.product.serializers import ProductSerializer
+
+
+class CartMemberSerializer(TimedSerializer):
+    email = serializers.EmailField(write_only=True)
+    name = serializers.CharField(read_only=True, source='user.name')
+    surname = serializers.CharField(read_only=True, source='user.surname')
+
+
+class CartItemSerializer(TimedSerializer):
+    product_slug = serializers.CharField(write_only=True)
+    product = ProductSerializer(read_only=True)
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartSerializer(TimedSerializer):
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(max_length=100)
+    created_at = serializers.DateTimeField(read_only=True)
+
+
+class CartDetailSerializer(CartSerializer):
+    members = CartMemberSerializer(many=True, read_only=True,
+                                   source='memberships')
+    items = CartItemSerializer(many=True, read_only=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2,
+                                     read_only=True, source='get_total')
+
+
+class StockReservationSerializer(TimedSerializer):
+    product_slug = serializers.CharField(read_only=True,
+                                         source='product.slug')
+    quantity = serializers.IntegerField(read_only=True)
+    expires_at = serializers.DateTimeField(read_only=True)
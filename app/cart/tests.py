@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import DatabaseError, connections
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from app.cart.models import Cart, CartItem, StockReservation
+from app.cart.reservations import consume, reserve_cart, sweep_expired
+from app.product.models import Category, Product
+from app.product.stock import OutOfStock
+from app.user.models import User
+
+
+def create_user():
+    return User.objects.create(email='user@example.com',
+                               phone='+10000000000', name='Name',
+                               surname='Surname')
+
+
+def create_product(category, name, stock):
+    return Product.objects.create(name=name, category=category, price=10,
+                                  image1='', stock=stock)
+
+
+def get_stock(product):
+    return Product.objects.values_list('stock', flat=True).get(pk=product.pk)
+
+
+class ReservationTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        category = Category.objects.create(name='Category')
+        self.first = create_product(category, 'First', 10)
+        self.second = create_product(category, 'Second', 1)
+        self.cart = Cart.objects.create(name='Cart', owner=self.user)
+
+    def add_item(self, product, quantity):
+        return CartItem.objects.create(cart=self.cart, product=product,
+                                       quantity=quantity)
+
+    def test_out_of_stock_rolls_back(self):
+        items = [self.add_item(self.first, 3), self.add_item(self.second, 2)]
+        with self.assertRaises(OutOfStock) as raised:
+            reserve_cart(self.cart, items, self.user.pk)
+        self.assertEqual(raised.exception.product_id, self.second.pk)
+        self.assertEqual(get_stock(self.first), 10)
+        self.assertEqual(get_stock(self.second), 1)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_reserve_again_renews(self):
+        item = self.add_item(self.first, 3)
+        reserve_cart(self.cart, [item], self.user.pk)
+        item.quantity = 5
+        item.save()
+        reservations = reserve_cart(self.cart, [item], self.user.pk)
+        self.assertEqual(get_stock(self.first), 5)
+        self.assertEqual([reservation.quantity
+                          for reservation in reservations], [5])
+        self.assertEqual(self.cart.reservations.count(), 1)
+
+    def test_sweep_expired(self):
+        item = self.add_item(self.first, 4)
+        reserve_cart(self.cart, [item], self.user.pk, ttl=60)
+        self.assertEqual(sweep_expired(), 0)
+        self.assertEqual(get_stock(self.first), 6)
+
+        released = sweep_expired(now=timezone.now() + timedelta(minutes=2))
+        self.assertEqual(released, 1)
+        self.assertEqual(get_stock(self.first), 10)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_consume_takes_difference(self):
+        item = self.add_item(self.first, 3)
+        reserve_cart(self.cart, [item], self.user.pk)
+        consume(self.cart, {self.first.pk: 5})
+        self.assertEqual(get_stock(self.first), 5)
+        self.assertFalse(self.cart.reservations.exists())
+
+
+class ConcurrentReservationTests(TransactionTestCase):
+    """
+    One hot product is reserved from many threads at once, the stock is
+    never oversold. Every thread uses its own connection
+    """
+    threads = 8
+    attempts = 5
+    stock = 20
+
+    def test_stock_is_not_oversold(self):
+        user = create_user()
+        category = Category.objects.create(name='Category')
+        product = create_product(category, 'Hot product', self.stock)
+        carts = Cart.objects.bulk_create([
+            Cart(name=f'Cart {index}', owner=user)
+            for index in range(self.threads * self.attempts)
+        ])
+        items = CartItem.objects.bulk_create([
+            CartItem(cart=cart, product=product, quantity=1)
+            for cart in carts
+        ])
+
+        def run(thread):
+            counts = {'reserved': 0, 'out_of_stock': 0, 'errors': 0}
+            try:
+                for index in range(thread * self.attempts,
+                                   (thread + 1) * self.attempts):
+                    try:
+                        reserve_cart(carts[index], [items[index]], user.pk)
+                        counts['reserved'] += 1
+                    except OutOfStock:
+                        counts['out_of_stock'] += 1
+                    except DatabaseError:
+                        counts['errors'] += 1
+            finally:
+                connections.close_all()
+            return counts
+
+        with ThreadPoolExecutor(self.threads) as executor:
+            results = list(executor.map(run, range(self.threads)))
+        counts = {key: sum(result[key] for result in results)
+                  for key in ('reserved', 'out_of_stock', 'errors')}
+
+        stock = get_stock(product)
+        held = StockReservation.objects.aggregate(
+            held=Sum('quantity', default=0))['held']
+        self.assertEqual(counts['errors'], 0)
+        self.assertEqual(counts['reserved'], self.stock)
+        self.assertEqual(held, counts['reserved'])
+        self.assertEqual(stock + held, self.stock)
+        self.assertEqual(stock, 0)
+
+        sweep_expired(now=timezone.now() + timedelta(days=1))
+        self.assertEqual(get_stock(product), self.stock)
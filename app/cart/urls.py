@@ -0,0 +1,18 @@
+from django.urls import path
+
+from app.cart.views import (CartAPIView,
+                            CartByIdAPIView,
+                            CartMemberAPIView,
+                            CartItemAPIView,
+                            CartItemBySlugAPIView,
+                            CartReservationAPIView)
+
+urlpatterns = [
+    path('carts/', CartAPIView.as_view()),
+    path('cart/<int:pk>/', CartByIdAPIView.as_view()),
+    path('cart/<int:pk>/members/', CartMemberAPIView.as_view()),
+    path('cart/<int:pk>/items/', CartItemAPIView.as_view()),
+    path('cart/<int:pk>/items/<slug:product_slug>/',
+         CartItemBySlugAPIView.as_view()),
+    path('cart/<int:pk>/reservation/', CartReservationAPIView.as_view())
+]
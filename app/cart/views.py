@@ -0,0 +1,316 @@
+from django.db.models import Exists, OuterRef, Prefetch
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from app.cart.models import Cart, CartItem, CartMember
+from app.cart.permissions import IsCartMember, IsCartOwner
+from app.cart.serializers import (CartSerializer,
+                                  CartDetailSerializer,
+                                  CartItemSerializer,
+                                  CartMemberSerializer,
+                                  StockReservationSerializer)
+from app.cart.reservations import release, reserve_cart
+from app.product.models import Product
+from app.user.models import User
+
+cart_tags = ['Carts']
+
+
+class CartObjectMixin:
+    """
+    Loads the cart by pk together with the membership of the user
+    """
+
+    def get_queryset(self):
+        return Cart.objects.annotate(is_member=Exists(
+            CartMember.objects.filter(cart=OuterRef('pk'),
+                                      user_id=self.request.user.pk)
+        ))
+
+    def get_object(self, pk):
+        try:
+            cart = self.get_queryset().get(pk=pk)
+            self.check_object_permissions(self.request, cart)
+            return cart
+        except Cart.DoesNotExist:
+            return None
+
+
+class CartAPIView(APIView):
+    """
+    Views to get or create user`s group carts
+    """
+    serializer_class = CartSerializer
+    permission_classes = [IsCartMember]
+
+    @extend_schema(
+        summary='Get carts',
+        description='View to get carts where the user is a member',
+        tags=cart_tags
+    )
+    def get(self, request):
+        carts = Cart.objects.filter(memberships__user_id=request.user.pk)
+
+        if not carts:
+            return Response({'message': 'Carts not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.serializer_class(carts, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary='Create a new cart',
+        description='View to create a new group cart',
+        tags=cart_tags
+    )
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            cart = Cart.objects.create(owner_id=request.user.pk,
+                                       **serializer.validated_data)
+            CartMember.objects.create(cart=cart, user_id=request.user.pk)
+            serializer = self.serializer_class(cart)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CartByIdAPIView(CartObjectMixin, APIView):
+    """
+    Views to get or delete a group cart
+    """
+    serializer_class = CartDetailSerializer
+
+    def get_queryset(self):
+        items = CartItem.objects.select_related('product__category')
+        return super().get_queryset().prefetch_related(
+            'memberships__user',
+            Prefetch('items', queryset=items)
+        )
+
+    @extend_schema(
+        summary='Get cart',
+        description='View to get cart with members, items and total',
+        tags=cart_tags,
+        operation_id='get_cart'
+    )
+    def get(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.serializer_class(cart)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary='Delete cart',
+        description='View to delete cart, only for the owner',
+        tags=cart_tags,
+        operation_id='delete_cart'
+    )
+    def delete(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        cart.is_active = False
+        cart.save(update_fields=['is_active'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def get_permissions(self):
+        if self.request.method == 'DELETE':
+            return [IsCartOwner()]
+        return [IsCartMember()]
+
+
+class CartMemberAPIView(CartObjectMixin, APIView):
+    """
+    View to add a member to a group cart
+    """
+    serializer_class = CartMemberSerializer
+    permission_classes = [IsCartOwner]
+
+    @extend_schema(
+        summary='Add member',
+        description='View to add a user to the cart by email',
+        tags=cart_tags
+    )
+    def post(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            email = serializer.validated_data['email']
+            try:
+                user = User.objects.get(email=email, is_active=True)
+            except User.DoesNotExist:
+                return Response({'message': f'User with email {email} '
+                                            f'not found'},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            member, _ = CartMember.objects.get_or_create(cart=cart,
+                                                         user=user)
+            serializer = self.serializer_class(member)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CartItemAPIView(CartObjectMixin, APIView):
+    """
+    View to add a product to a group cart
+    """
+    serializer_class = CartItemSerializer
+    permission_classes = [IsCartMember]
+
+    @extend_schema(
+        summary='Add item',
+        description='View to add a quantity of the product to the cart',
+        tags=cart_tags
+    )
+    def post(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            data = serializer.validated_data
+            product_slug = data['product_slug']
+            try:
+                product = (Product.objects.select_related('category')
+                           .get(slug=product_slug))
+            except Product.DoesNotExist:
+                return Response({'message': f'Product with slug '
+                                            f'{product_slug} not found'},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            CartItem.objects.add(cart, product, data['quantity'],
+                                 user_id=request.user.pk)
+            item = CartItem.objects.get(cart=cart, product=product)
+            item.product = product
+            serializer = self.serializer_class(item)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CartItemBySlugAPIView(CartObjectMixin, APIView):
+    """
+    Views to change the quantity of a product in the cart or remove it
+    """
+    serializer_class = CartItemSerializer
+    permission_classes = [IsCartMember]
+
+    def get_item(self, cart, product_slug):
+        return CartItem.objects.filter(cart=cart,
+                                       product__slug=product_slug)
+
+    @extend_schema(
+        summary='Update item',
+        description='View to set the quantity of the product in the cart',
+        tags=cart_tags,
+        operation_id='update_cart_item'
+    )
+    def put(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        data = request.data.copy()
+        data['product_slug'] = kwargs.get('product_slug')
+        serializer = self.serializer_class(data=data)
+        if serializer.is_valid(raise_exception=True):
+            items = self.get_item(cart, kwargs.get('product_slug'))
+
+            if not items.update(
+                    quantity=serializer.validated_data['quantity']):
+                return Response({'message': 'Item not found'},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            item = items.select_related('product__category').get()
+            serializer = self.serializer_class(item)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(
+        summary='Delete item',
+        description='View to remove the product from the cart',
+        tags=cart_tags,
+        operation_id='delete_cart_item'
+    )
+    def delete(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        deleted, _ = self.get_item(cart, kwargs.get('product_slug')).delete()
+
+        if not deleted:
+            return Response({'message': 'Item not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CartReservationAPIView(CartObjectMixin, APIView):
+    """
+    Views to reserve the stock of the cart items before checkout or to
+    release it
+    """
+    serializer_class = StockReservationSerializer
+    permission_classes = [IsCartMember]
+
+    @extend_schema(
+        summary='Reserve items',
+        description='View to take the items of the cart from the stock '
+                    'for STOCK_RESERVATION_TTL seconds, earlier '
+                    'reservations of the cart are renewed. Answers 409 '
+                    'when some product is out of stock',
+        tags=cart_tags,
+        operation_id='reserve_cart_items'
+    )
+    def post(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        items = list(cart.items.select_related('product'))
+        if not items:
+            return Response({'message': 'Cart is empty'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        reservations = reserve_cart(cart, items, request.user.pk)
+        serializer = self.serializer_class(reservations, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary='Release items',
+        description='View to return the reserved items of the cart to the '
+                    'stock',
+        tags=cart_tags,
+        operation_id='release_cart_items'
+    )
+    def delete(self, request, *args, **kwargs):
+        cart = self.get_object(kwargs.get('pk'))
+
+        if not cart:
+            return Response({'message': 'Cart not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        release(cart.reservations.all())
+        return Response(status=status.HTTP_204_NO_CONTENT)
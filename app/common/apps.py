@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.common'
+
+    def ready(self):
+        from app.common.instrumentation import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
@@ -0,0 +1,225 @@
+import json
+import math
+import re
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import URLResolver, get_resolver
+
+from app.cart.models import Cart, CartItem, CartMember
+from app.product.benchmarks import create_catalog
+from app.product.models import Product
+from app.user.benchmarks import BENCHMARK_PASSWORD, create_users
+from app.user.serializers import CustomTokenObtainPairSerializer
+
+EXCLUDED_ROUTES = ('admin/',)
+PARAMETER = re.compile(r'<(?:\w+:)?(\w+)>')
+
+
+class QueryCounter:
+    """
+    Execute wrapper which counts queries
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def get_routes(patterns=None, prefix=''):
+    """
+    Returned (route, view) of every URL pattern
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if route.startswith(EXCLUDED_ROUTES):
+            continue
+        if isinstance(pattern, URLResolver):
+            yield from get_routes(pattern.url_patterns, route)
+        else:
+            yield route, pattern.callback
+
+
+def create_dataset(categories, products, users, addresses):
+    """
+    Creates the synthetic catalog, users with addresses and a cart, and
+    returned the values for URL parameters and request bodies
+    """
+    categories = create_catalog(categories, products)
+    users = create_users(users, addresses)
+    user = users[0]
+    product = Product.objects.order_by('id').first()
+
+    cart = Cart.objects.create(name='Benchmark cart', owner=user)
+    CartMember.objects.create(cart=cart, user=user)
+    CartItem.objects.bulk_create([
+        CartItem(cart=cart, product=item, quantity=index + 1)
+        for index, item in enumerate(Product.objects.order_by('id')[:10])
+    ])
+
+    refresh = CustomTokenObtainPairSerializer.get_token(user)
+    return {
+        'access': str(refresh.access_token),
+        'parameters': {
+            'category': {'slug': categories[0].slug},
+            'products': {'category_slug': categories[0].slug},
+            'product': {'slug': product.slug},
+            'address': {'pk': user.address.first().pk},
+            'cart': {'pk': cart.pk, 'product_slug': product.slug}
+        },
+        'bodies': {
+            'api/token/': {'email': user.email,
+                           'password': BENCHMARK_PASSWORD},
+            'api/token/verify/': {'token': str(refresh.access_token)},
+            'api/token/refresh/': {'refresh': str(refresh)}
+        },
+        'query_strings': {
+            'api/products/search/': 'q=benchmark+product+1'
+        }
+    }
+
+
+def get_scenarios(dataset):
+    """
+    Returned (method, path, body) for every route: GET for views with a
+    get method and POST for routes with a request body in the dataset.
+    Routes with parameters missing in the dataset are skipped
+    """
+    for route, view in get_routes():
+        section = (route.removeprefix('api/').removeprefix('async/')
+                   .split('/')[0])
+        parameters = dataset['parameters'].get(section, {})
+        names = PARAMETER.findall(route)
+        if any(name not in parameters for name in names):
+            continue
+
+        path = '/' + PARAMETER.sub(
+            lambda match: str(parameters[match.group(1)]), route)
+        if route in dataset['query_strings']:
+            path = f'{path}?{dataset["query_strings"][route]}'
+        view_class = getattr(view, 'view_class', None)
+
+        if route in dataset['bodies']:
+            yield 'POST', path, dataset['bodies'][route]
+        elif view_class is None or hasattr(view_class, 'get'):
+            yield 'GET', path, None
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(math.ceil(len(values) * percent / 100) - 1, 0)]
+
+
+def run_scenario(client, method, path, body, requests, cold_cache=False):
+    """
+    Sends the request requests times after one warm-up request and
+    returned latency percentiles, query count and response size
+    """
+    data = json.dumps(body) if body is not None else ''
+    timings = []
+    queries = []
+    for _ in range(requests + 1):
+        if cold_cache:
+            cache.clear()
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = client.generic(method, path, data,
+                                      content_type='application/json')
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.count)
+
+    timings, queries = timings[1:], queries[1:]
+    return {
+        'method': method,
+        'path': path,
+        'status': response.status_code,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'queries': max(queries),
+        'bytes': len(response.content)
+    }
+
+
+def run_benchmark(dataset, requests, cold_cache=False):
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {dataset["access"]}')
+    results = {}
+    for method, path, body in get_scenarios(dataset):
+        result = run_scenario(client, method, path, body, requests,
+                              cold_cache)
+        results[f'{method} {path}'] = result
+    return results
+
+
+def compare_results(baseline, results):
+    """
+    Returned rows (endpoint, metric, old, new, change in percent) for
+    metrics which differ between two runs
+    """
+    rows = []
+    for endpoint, result in results.items():
+        old = baseline.get(endpoint)
+        if old is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'queries', 'bytes'):
+            if old[metric] == result[metric]:
+                continue
+            change = ((result[metric] - old[metric]) / old[metric] * 100
+                      if old[metric] else math.inf)
+            rows.append((endpoint, metric, old[metric], result[metric],
+                         change))
+    return rows
+
+
+def fetch(url, timeout):
+    """
+    Returned status and latency in milliseconds of one GET request, the
+    status is None when the server did not answer
+    """
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    except OSError:
+        status = None
+    return status, (time.perf_counter() - start) * 1000
+
+
+def run_load_test(url, requests, concurrency, timeout=10):
+    """
+    Sends requests GET requests to a running server from concurrency
+    threads and returned throughput, latency percentiles and errors
+    """
+    with ThreadPoolExecutor(concurrency) as executor:
+        start = time.perf_counter()
+        results = list(executor.map(lambda _: fetch(url, timeout),
+                                    range(requests)))
+        elapsed = time.perf_counter() - start
+
+    timings = [timing for _, timing in results]
+    return {
+        'url': url,
+        'requests': requests,
+        'concurrency': concurrency,
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'errors': sum(1 for status, _ in results
+                      if status is None or status >= 500)
+    }
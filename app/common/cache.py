@@ -0,0 +1,127 @@
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.settings import api_settings
+
+VERSION_KEY = 'version:{}'
+
+
+def get_versions(*models):
+    """
+    Returned the current cache version of every model. A missing version
+    starts from the current time, so entries cached before an eviction
+    are never reused
+    """
+    keys = [VERSION_KEY.format(model._meta.label_lower) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(*models):
+    keys = [VERSION_KEY.format(model._meta.label_lower) for model in models]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns(), None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    """
+    Invalidates all cached responses built from the model. The version is
+    bumped after commit, so a concurrent read can not cache old data
+    under the new version
+    """
+    key = VERSION_KEY.format(model._meta.label_lower)
+
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+    transaction.on_commit(bump)
+
+
+def build_cache_key(scope, parts, versions):
+    versions = '.'.join(str(version) for version in versions)
+    return ':'.join(['response', scope, *map(str, parts), versions])
+
+
+def get_cache_key(scope, *parts, models=()):
+    return build_cache_key(scope, parts, get_versions(*models))
+
+
+async def aget_cache_key(scope, *parts, models=()):
+    return build_cache_key(scope, parts, await aget_versions(*models))
+
+
+def get_cached(key):
+    return cache.get(key)
+
+
+async def aget_cached(key):
+    return await cache.aget(key)
+
+
+def render_data(data):
+    """
+    Returned data rendered with the default renderer and its content type
+    """
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    content = renderer.render(data)
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f'{content_type}; charset={renderer.charset}'
+    return content, content_type
+
+
+def build_entry(data):
+    content, content_type = render_data(data)
+    return {
+        'content': content,
+        'content_type': content_type,
+        'etag': f'"{md5(content).hexdigest()}"'
+    }
+
+
+def set_cached(key, data):
+    """
+    Renders data with the default renderer and stores the rendered
+    response with its ETag
+    """
+    entry = build_entry(data)
+    cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+    return entry
+
+
+async def aset_cached(key, data):
+    entry = build_entry(data)
+    await cache.aset(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+    return entry
+
+
+def cached_response(request, entry):
+    """
+    Returned the cached response or 304 when the client has the same
+    version of it
+    """
+    etags = [etag.removeprefix('W/') for etag in
+             parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))]
+    if entry['etag'] in etags or '*' in etags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['content'],
+                                content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    return response
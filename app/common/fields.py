@@ -0,0 +1,32 @@
+from autoslug import AutoSlugField as BaseAutoSlugField
+from autoslug.utils import generate_unique_slug
+
+
+class AutoSlugField(BaseAutoSlugField):
+    """
+    AutoSlugField which keeps a slug prepared in advance. Instances with
+    the _slug_prepared attribute skip the uniqueness queries, the caller
+    guarantees the slug is unique (for example bulk import). Reserved
+    slugs are treated as taken, so they get a number like duplicates
+    """
+
+    def __init__(self, *args, reserved=(), **kwargs):
+        self.reserved = tuple(reserved)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.reserved:
+            kwargs['reserved'] = self.reserved
+        return name, path, args, kwargs
+
+    def pre_save(self, instance, add):
+        if getattr(instance, '_slug_prepared', False):
+            return getattr(instance, self.attname)
+        slug = super().pre_save(instance, add)
+        if slug in self.reserved:
+            slug = generate_unique_slug(self, instance,
+                                        f'{slug}{self.index_sep}2',
+                                        self.manager)
+            setattr(instance, self.attname, slug)
+        return slug
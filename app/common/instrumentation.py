@@ -0,0 +1,196 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import md5
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_fingerprint(sql):
+    """
+    Returned the query with literals and placeholders replaced by ?, so
+    the same query with other parameters has the same fingerprint
+    """
+    sql = LITERALS.sub('?', sql.replace('%s', '?'))
+    sql = PLACEHOLDER_LISTS.sub('(...)', sql)
+    return ' '.join(sql.split())
+
+
+class RequestMetrics:
+    """
+    Metrics of one request
+
+    Fields:
+        queries: Number of queries
+        sql_time: Time of queries in seconds
+        serializer_time: Time of serialization in seconds
+        fingerprints: Counter of query fingerprints
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.fingerprints = Counter()
+        self.serializing = False
+
+    def add_query(self, sql, duration):
+        self.sql_time += duration
+        self.queries += 1
+        self.fingerprints[get_fingerprint(sql)] += 1
+
+    def get_duplicates(self):
+        return [
+            {'fingerprint': md5(sql.encode()).hexdigest()[:12],
+             'count': count,
+             'sql': sql[:200]}
+            for sql, count in self.fingerprints.most_common()
+            if count > 1
+        ]
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper of every database connection, adds the query to the
+    metrics of the current request. The metrics are found by the context
+    variable, so queries of async views which run in another thread are
+    counted too
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - start)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Handler of connection_created which adds record_query to the
+    execute wrappers of the connection
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def measure_serializer():
+    """
+    Adds the time of the block to the serializer time of the current
+    request, nested blocks are counted once
+    """
+    metrics = current_metrics.get()
+    if metrics is None or metrics.serializing:
+        yield
+        return
+
+    metrics.serializing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics.serializing = False
+
+
+def get_query_budget(request):
+    """
+    Returned the query budget of the view, the view attribute
+    query_budget overrides the QUERY_BUDGET setting
+    """
+    match = request.resolver_match
+    view_class = getattr(match.func, 'view_class', None) if match else None
+    return getattr(view_class, 'query_budget', settings.QUERY_BUDGET)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Counts queries, SQL time, duplicate queries and serializer time of
+    every request, in sync and async mode. Metrics are returned in the
+    Server-Timing header and logged as one JSON line. A request with more
+    queries than the budget is logged as a warning, or raises
+    QueryBudgetExceeded with QUERY_BUDGET_STRICT, which fails the test
+    which made the request
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_metrics(request, response, metrics,
+                                    time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_metrics(request, response, metrics,
+                                    time.perf_counter() - start)
+
+    def process_metrics(self, request, response, metrics, total_time):
+        response['Server-Timing'] = ', '.join([
+            f'sql;dur={metrics.sql_time * 1000:.2f};'
+            f'desc="{metrics.queries} queries"',
+            f'serializer;dur={metrics.serializer_time * 1000:.2f}',
+            f'total;dur={total_time * 1000:.2f}'
+        ])
+
+        match = request.resolver_match
+        duplicates = metrics.get_duplicates()
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'sql_ms': round(metrics.sql_time * 1000, 2),
+            'serializer_ms': round(metrics.serializer_time * 1000, 2),
+            'total_ms': round(total_time * 1000, 2),
+            'duplicates': duplicates
+        }))
+
+        budget = get_query_budget(request)
+        if budget is not None and metrics.queries > budget:
+            message = (f'{request.method} {request.path} made '
+                       f'{metrics.queries} queries, the budget is {budget}')
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from app.common.benchmarks import (compare_results, create_dataset,
+                                   run_benchmark)
+
+
+class Command(BaseCommand):
+    help = ('Benchmark every API endpoint on a synthetic catalog in a '
+            'separate test database, which is destroyed at the end')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--products', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--addresses', type=int, default=3,
+                            help='Number of addresses of every user')
+        parser.add_argument('--requests', type=int, default=20,
+                            help='Number of requests to every endpoint')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Clear the cache before every request')
+        parser.add_argument('--output', type=Path,
+                            help='Save results to a JSON file')
+        parser.add_argument('--compare', type=Path,
+                            help='Compare results with a saved JSON file')
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            dataset = create_dataset(options['categories'],
+                                     options['products'],
+                                     options['users'],
+                                     options['addresses'])
+            results = run_benchmark(dataset, options['requests'],
+                                    options['cold_cache'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for endpoint, result in results.items():
+            self.stdout.write(
+                f'{endpoint}: {result["status"]}, '
+                f'p50 {result["p50_ms"]} ms, p95 {result["p95_ms"]} ms, '
+                f'{result["queries"]} queries, {result["bytes"]} bytes')
+
+        if options['output']:
+            options['output'].write_text(
+                json.dumps(results, indent=2, sort_keys=True))
+
+        if options['compare']:
+            baseline = json.loads(options['compare'].read_text())
+            for endpoint, metric, old, new, change in compare_results(
+                    baseline, results):
+                style = (self.style.ERROR if new > old
+                         else self.style.SUCCESS)
+                self.stdout.write(style(
+                    f'{endpoint} {metric}: {old} -> {new} ({change:+.1f}%)'))
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from app.product.benchmarks import create_catalog
+from app.product.models import Category, Product
+from app.user.benchmarks import create_users
+from app.user.models import Address
+
+
+class Command(BaseCommand):
+    help = ('Show query plans of the lookups of active rows on a synthetic '
+            'catalog, the catalog is rolled back at the end')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--products', type=int, default=20000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--addresses', type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_catalog(options['categories'], options['products'])
+            users = create_users(options['users'], options['addresses'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            self.explain(users[0])
+            transaction.set_rollback(True)
+
+    def get_querysets(self, user):
+        category = Category.objects.order_by('id').first()
+        product = Product.objects.order_by('id').first()
+        return {
+            'Category by slug': Category.objects.filter(slug=category.slug),
+            'Product by slug': Product.objects.filter(slug=product.slug),
+            'Products of a category': (
+                Product.objects.filter(category_id=category.pk)
+                .order_by('category_id', 'id')[:21]
+            ),
+            'Products by price': (
+                Product.objects.filter(final_price__gte=100)
+                .order_by('final_price', 'id')[:21]
+            ),
+            'Addresses of a user': (
+                Address.objects.filter(user_id=user.pk).order_by('id')
+            )
+        }
+
+    def explain(self, user):
+        names = [index.name for model in (Category, Product, Address)
+                 for index in model._meta.indexes]
+
+        for title, queryset in self.get_querysets(user).items():
+            plan = queryset.explain()
+            used = [name for name in names if name in plan]
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{title} ({connection.vendor})'))
+            self.stdout.write(plan)
+            if used:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Partial index: {", ".join(used)}'))
+            self.stdout.write('')
@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.common.benchmarks import run_load_test
+
+
+class Command(BaseCommand):
+    help = ('Load test running servers, for example the WSGI application '
+            'against the ASGI one: load_test '
+            'wsgi=http://127.0.0.1:8000/api/products/ '
+            'asgi=http://127.0.0.1:8001/api/async/products/')
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='+',
+                            help='URLs to test as name=url or url')
+        parser.add_argument('--requests', type=int, default=1000,
+                            help='Number of requests to every URL')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--timeout', type=float, default=10)
+        parser.add_argument('--json', action='store_true',
+                            help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        results = {}
+        for target in options['targets']:
+            name, _, url = target.partition('=')
+            if '://' in name:
+                name, url = None, target
+            if not url.startswith(('http://', 'https://')):
+                raise CommandError(f'Invalid URL {url}')
+            results[name or url] = run_load_test(url,
+                                                 options['requests'],
+                                                 options['concurrency'],
+                                                 options['timeout'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name}: {result["rps"]} requests/s, '
+                f'p50 {result["p50_ms"]} ms, p95 {result["p95_ms"]} ms, '
+                f'p99 {result["p99_ms"]} ms, {result["errors"]} errors')
@@ -1,30 +1,64 @@
 from django.db import models
 
+from app.common.cache import bump_version
+
 
 class IsActiveQuerySet(models.QuerySet):
     """
     Custom QuerySet which, when deleted, changes the field is_active=False.
     If you pass the hard_delete key to the delete method, the entry will
-    be completely deleted
+    be completely deleted. Every write bumps the cache version of the model
+
+    Methods:
+        restore(): Changes the field is_active=True, call it on a queryset
+            of Manager.unfiltered()
     """
 
     def delete(self, hard_delete=False):
         if hard_delete:
-            super().delete()
+            result = super().delete()
+            bump_version(self.model)
+            return result
         else:
             return self.update(is_active=False)
 
+    delete.queryset_only = True
+
+    def restore(self):
+        return self.update(is_active=True)
+
+    restore.queryset_only = True
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        bump_version(self.model)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bump_version(self.model)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        bump_version(self.model)
+        return rows
+
 
 class IsActiveManager(models.Manager):
     """
-    Custom manager for receiving records with the is_active=True field
+    Custom manager for receiving records with the is_active=True field.
+    Use IsActiveManager.from_queryset() for a QuerySet subclassing
+    IsActiveQuerySet
     """
 
+    _queryset_class = IsActiveQuerySet
+
     def get_queryset(self):
-        return IsActiveQuerySet(self.model).filter(is_active=True)
+        return self.unfiltered().filter(is_active=True)
 
     def unfiltered(self):
-        return IsActiveQuerySet(self.model)
+        return self._queryset_class(self.model, using=self._db)
 
     def hard_delete(self):
         """
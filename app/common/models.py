@@ -2,6 +2,7 @@ import uuid
 
 from django.db import models
 
+from app.common.cache import bump_version
 from app.common.managers import IsActiveManager
 
 
@@ -12,6 +13,8 @@ class BaseModel(models.Model):
     Fields:
         id (uuid): ID anything
         is_active (bool): Anything is deleted
+
+    Saving or deleting a record bumps the cache version of the model
     """
 
     is_active = models.BooleanField(default=True)
@@ -20,3 +23,12 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_version(type(self))
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_version(type(self))
+        return result
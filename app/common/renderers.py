@@ -0,0 +1,44 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer on orjson. Datetime, date, time and UUID are encoded by
+    orjson itself, other types (Decimal, lazy strings, querysets) are
+    encoded the same way as by the default JSONRenderer. Without orjson,
+    with indent, ASCII or non-compact output, or for data which orjson can
+    not encode, the default JSONRenderer is used
+    """
+
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+               if orjson else None)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (orjson is None or indent is not None
+                or self.ensure_ascii or not self.compact):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default,
+                               option=self.options)
+        except orjson.JSONEncodeError:
+            # Integers wider than 64 bits, the default JSONRenderer
+            # encodes them
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # The same escaping of line separators as in JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028')
+            ret = ret.replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from app.common.instrumentation import measure_serializer
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with measure_serializer():
+            return super().data
+
+
+class TimedSerializer(serializers.Serializer):
+    """
+    Serializer which time is counted in the serializer time of the request
+    metrics, also with many=True
+    """
+
+    class Meta:
+        list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with measure_serializer():
+            return super().data
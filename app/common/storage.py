@@ -0,0 +1,70 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files.storage import FileSystemStorage
+
+HASHED_NAME = re.compile(r'(?:^|/)[0-9a-f]{2}/(?P<hash>[0-9a-f]{32})\.\w+$')
+
+
+def get_content_hash(content):
+    """
+    Returned sha256 of the file read in chunks, so a big upload is not
+    loaded into memory. The file is rewound for saving
+    """
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+    content.seek(0)
+    return digest.hexdigest()[:32]
+
+
+def get_name_hash(name):
+    """
+    Returned the content hash of a content addressed name, None for
+    other names
+    """
+    match = HASHED_NAME.search(name or '')
+    return match['hash'] if match else None
+
+
+class ContentAddressedMixin:
+    """
+    Storage mixin which saves a file under the hash of its content:
+    upload_to/ab/abcdef....ext. Identical uploads are stored once and a
+    name always means the same content, so files can be cached forever.
+    Works on top of any storage backend with the same keys, for example
+    an S3 storage in production and ContentAddressedStorage locally
+    """
+
+    def get_hashed_name(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        content_hash = get_content_hash(content)
+        return posixpath.join(directory, content_hash[:2],
+                              f'{content_hash}{extension}')
+
+    def get_available_name(self, name, max_length=None):
+        # The name is chosen by _save from the content
+        return name
+
+    def _save(self, name, content):
+        name = self.get_hashed_name(name, content)
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+
+class ContentAddressedStorage(ContentAddressedMixin, FileSystemStorage):
+    """
+    Content addressed storage in MEDIA_ROOT, the local stand-in of an
+    object storage. Uploads are streamed to disk by chunks, a temporary
+    upload file is moved without copying. Two requests which save the same
+    content at once write the same bytes, so overwriting is allowed
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,68 @@
+import json
+import unittest
+
+from django.test import SimpleTestCase, TestCase
+
+from app.common import renderers
+from app.common.pagination import KeysetPagination
+from app.common.renderers import ORJSONRenderer
+from app.product.models import Category, Product
+
+
+class KeysetPaginationCursorTests(TestCase):
+    """
+    Crafted cursors of product lists are answered with 404, not 500
+    """
+    paths = ['/api/products/', '/api/async/products/']
+
+    def get(self, path, position, **params):
+        cursor = KeysetPagination().encode_cursor(position)
+        return self.client.get(path, {'cursor': cursor, **params})
+
+    def test_not_a_number(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                response = self.get(path, ['abc'])
+                self.assertEqual(response.status_code, 404)
+
+    def test_not_a_scalar(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                response = self.get(path, [[]])
+                self.assertEqual(response.status_code, 404)
+
+    def test_malformed_decimal(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                response = self.get(path, ['1.2.3', '1'], ordering='price')
+                self.assertEqual(response.status_code, 404)
+
+
+@unittest.skipIf(renderers.orjson is None, 'orjson is not installed')
+class ORJSONRendererTests(SimpleTestCase):
+    def test_wide_integer(self):
+        data = {'count': 2 ** 70, 'items': [-2 ** 64]}
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(json.loads(rendered), data)
+
+
+class ReservedSlugTests(TestCase):
+    """
+    Categories do not get the slugs of the product routes, which would
+    shadow their products
+    """
+
+    def test_reserved_slug_is_numbered(self):
+        slugs = [Category.objects.create(name=name).slug
+                 for name in ['Search', 'Import', 'Bulk', 'Decor']]
+        self.assertEqual(slugs, ['search-2', 'import-2', 'bulk-2', 'decor'])
+
+    def test_category_route(self):
+        category = Category.objects.create(name='Search')
+        Product.objects.create(name='Lens', category=category, price=5,
+                               image1='')
+        response = self.client.get(f'/api/products/{category.slug}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([product['name']
+                          for product in response.json()['results']],
+                         ['Lens'])
@@ -1,4 +1,21 @@
 def update_model(model, data):
+    """
+    Sets the values of data which differ from the values of the model.
+    Returned names of the changed fields for save(update_fields=...), the
+    list is empty when nothing changed. Relations are compared by the key,
+    so the related object is not loaded
+    """
+    changed = []
     for key, value in data.items():
-        setattr(model, key, value)
-    return model
+        field = model._meta.get_field(key)
+        if field.is_relation:
+            current = getattr(model, field.attname)
+            new = value.pk if value is not None else None
+        else:
+            current = getattr(model, key)
+            new = value
+
+        if current != new:
+            setattr(model, key, value)
+            changed.append(field.name)
+    return changed
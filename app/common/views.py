@@ -0,0 +1,132 @@
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import (FileResponse,
+                         Http404,
+                         HttpResponse,
+                         HttpResponseNotModified,
+                         StreamingHttpResponse)
+from django.utils.http import parse_etags
+from django.views import View
+
+from app.common.storage import get_name_hash
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    Returned (start, end) of a single byte range, end is inclusive. None
+    when the header is absent or has several ranges, so the whole file is
+    sent. Raises ValueError for a range out of the file
+    """
+    match = RANGE.match(header.replace(' ', '')) if header else None
+    if not match or not any(match.groups()):
+        return None
+
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def iter_range(file, start, length):
+    """
+    Yields length bytes of the file from start by chunks and closes it
+    """
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+class MediaView(View):
+    """
+    View to serve files of the media storage. Content addressed files
+    never change, so they are cached forever with the hash as ETag, other
+    files get the ETag of size and modification time. Single byte ranges
+    are supported. With MEDIA_ACCEL_REDIRECT the file is sent by the web
+    server through X-Accel-Redirect, otherwise FileResponse uses sendfile
+    of the WSGI server when it has one
+    """
+    http_method_names = ['get', 'head']
+
+    def get(self, request, path):
+        try:
+            full_path = default_storage.path(path)
+        except SuspiciousFileOperation:
+            raise Http404(path)
+
+        try:
+            stat = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise Http404(path)
+        if not os.path.isfile(full_path):
+            raise Http404(path)
+
+        content_hash = get_name_hash(path)
+        if content_hash:
+            etag = f'"{content_hash}"'
+            cache_control = settings.MEDIA_CACHE_CONTROL
+        else:
+            etag = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+            cache_control = (f'public, '
+                             f'max-age={settings.MEDIA_CACHE_TIMEOUT}')
+        headers = {
+            'ETag': etag,
+            'Cache-Control': cache_control,
+            'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+            'Accept-Ranges': 'bytes'
+        }
+
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (etag in parse_etags(if_none_match)
+                              or if_none_match.strip() == '*'):
+            return HttpResponseNotModified(headers=headers)
+
+        if settings.MEDIA_ACCEL_REDIRECT:
+            response = HttpResponse(headers=headers)
+            response['X-Accel-Redirect'] = (settings.MEDIA_ACCEL_REDIRECT
+                                            + path)
+            del response['Content-Type']
+            return response
+
+        try:
+            byte_range = parse_range(request.headers.get('Range'),
+                                     stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416, headers=headers)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+        file = open(full_path, 'rb')
+        if byte_range is None:
+            response = FileResponse(file, headers=headers)
+        else:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(iter_range(file, start, length),
+                                             status=206, headers=headers)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = length
+            response['Content-Type'] = (mimetypes.guess_type(path)[0]
+                                        or 'application/octet-stream')
+        return response
@@ -0,0 +1,111 @@
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from app.cart.models import CartItem
+from app.cart.reservations import consume
+from app.order.models import Order, OrderLine
+from app.product.models import Product
+from app.user.models import Address
+
+
+class CheckoutError(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Order can not be made'
+    default_code = 'checkout_error'
+
+    def __init__(self, message, status_code=None):
+        super().__init__()
+        if status_code is not None:
+            self.status_code = status_code
+        self.detail = {'message': message}
+
+
+def get_order(user_id, idempotency_key):
+    """
+    Returned the order of the user made with the Idempotency-Key or None
+    """
+    if idempotency_key is None:
+        return None
+    return (Order.objects.filter(user_id=user_id,
+                                 idempotency_key=idempotency_key)
+            .first())
+
+
+def create_order(user_id, cart, items, address_id, idempotency_key=None):
+    """
+    Makes the order from the locked cart items. All products are loaded
+    by one in_bulk and their prices are copied to the lines, which are
+    inserted by one bulk_create. The order row is inserted before the
+    stock is taken, so a concurrent retry with the same Idempotency-Key
+    fails on the unique constraint without touching the stock. Must be
+    called inside a transaction
+    """
+    address = Address.objects.filter(user_id=user_id, pk=address_id).first()
+    if address is None:
+        raise CheckoutError('Address not found', status.HTTP_404_NOT_FOUND)
+
+    products = Product.objects.in_bulk(
+        [product_id for _, product_id, _ in items])
+    missing = [product_id for _, product_id, _ in items
+               if product_id not in products]
+    if missing:
+        raise CheckoutError(f'Products {missing} are not available')
+
+    lines = []
+    quantities = {}
+    for _, product_id, quantity in items:
+        product = products[product_id]
+        quantities[product_id] = quantity
+        lines.append(OrderLine(product=product, name=product.name,
+                               price=product.price, sale=product.sale,
+                               final_price=product.get_price_result(),
+                               quantity=quantity))
+
+    order = Order.objects.create(
+        user_id=user_id, cart=cart, address=address,
+        shipping_address=address.get_full_address(),
+        total=sum(line.get_total() for line in lines),
+        idempotency_key=idempotency_key)
+    consume(cart, quantities)
+
+    for line in lines:
+        line.order = order
+    OrderLine.objects.bulk_create(lines)
+    CartItem.objects.filter(pk__in=[pk for pk, _, _ in items]).delete()
+    return order
+
+
+def checkout(user_id, cart, address_id, idempotency_key=None):
+    """
+    Makes the order from the cart items in one transaction. Returned
+    (order, created). The items are locked, so members can not change
+    them until commit. A request with the Idempotency-Key of an earlier
+    order returns that order, also when both requests run at once: the
+    second one waits for the lock of the items and finds the order, or
+    fails on the unique constraint
+    """
+    order = get_order(user_id, idempotency_key)
+    if order is not None:
+        return order, False
+
+    try:
+        with transaction.atomic():
+            items = list(CartItem.objects.select_for_update()
+                         .filter(cart=cart).order_by('product_id')
+                         .values_list('pk', 'product_id', 'quantity'))
+
+            order = get_order(user_id, idempotency_key)
+            if order is not None:
+                return order, False
+            if not items:
+                raise CheckoutError('Cart is empty',
+                                    status.HTTP_400_BAD_REQUEST)
+
+            return create_order(user_id, cart, items, address_id,
+                                idempotency_key), True
+    except IntegrityError:
+        order = get_order(user_id, idempotency_key)
+        if order is None:
+            raise
+        return order, False
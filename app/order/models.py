@@ -0,0 +1,94 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models
+
+from app.cart.models import Cart
+from app.product.models import Product
+from app.user.models import Address
+
+
+class Order(models.Model):
+    """
+    Order made by the checkout of a cart. Prices and the address are
+    copied at checkout, so later changes of products and addresses do not
+    change the order
+
+    Fields:
+        user (ForeignKey): User who made the order
+        cart (ForeignKey): Cart the order was made from
+        address (ForeignKey): Delivery address
+        shipping_address (str): Full delivery address at checkout
+        total (DecimalField): Final price of all lines
+        idempotency_key (str): Idempotency-Key of the checkout request,
+                               it is unique per user, so a retried request
+                               returns the same order
+        created_at (DateTimeField): Order creation date
+
+    Methods:
+        __str__(): Returned order number
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE,
+                             related_name='orders')
+    cart = models.ForeignKey(Cart,
+                             on_delete=models.SET_NULL,
+                             null=True,
+                             related_name='orders')
+    address = models.ForeignKey(Address,
+                                on_delete=models.SET_NULL,
+                                null=True,
+                                related_name='orders')
+    shipping_address = models.CharField(max_length=255)
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+    idempotency_key = models.CharField(max_length=255, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'idempotency_key'],
+                                    name='order_user_idempotency_key')
+        ]
+        indexes = [
+            # Orders of a user in the keyset order
+            models.Index(fields=['user', 'id'], name='order_user_idx')
+        ]
+
+    def __str__(self):
+        return f'Order {self.pk}'
+
+
+class OrderLine(models.Model):
+    """
+    Product of an order with the price at checkout
+
+    Fields:
+        order (ForeignKey): Order
+        product (ForeignKey): Product, None when it is deleted
+        name (str): Product name at checkout
+        price (DecimalField): Product price at checkout
+        sale (int): Product sale at checkout
+        final_price (DecimalField): Price with the discount at checkout
+        quantity (int): Ordered quantity
+
+    Methods:
+        get_total(): Returned the final price of the line
+    """
+
+    order = models.ForeignKey(Order,
+                              on_delete=models.CASCADE,
+                              related_name='lines')
+    product = models.ForeignKey(Product,
+                                on_delete=models.SET_NULL,
+                                null=True,
+                                related_name='order_lines')
+    name = models.CharField(max_length=150)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    sale = models.IntegerField(default=0)
+    final_price = models.DecimalField(max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField()
+
+    def get_total(self):
+        return (Decimal(self.final_price) * self.quantity).quantize(
+            Decimal('0.01'))
@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+from app.common.serializers import TimedSerializer
+
+
+class OrderLineSerializer(TimedSerializer):
+    product_slug = serializers.SlugField(read_only=True,
+                                         source='product.slug',
+                                         allow_null=True)
+    name = serializers.CharField(read_only=True)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2,
+                                     read_only=True)
+    sale = serializers.IntegerField(read_only=True)
+    final_price = serializers.DecimalField(max_digits=10, decimal_places=2,
+                                           read_only=True)
+    quantity = serializers.IntegerField(read_only=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2,
+                                     read_only=True, source='get_total')
+
+
+class OrderSerializer(TimedSerializer):
+    id = serializers.IntegerField(read_only=True)
+    cart_id = serializers.IntegerField(write_only=True)
+    address_id = serializers.IntegerField()
+    shipping_address = serializers.CharField(read_only=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2,
+                                     read_only=True)
+    lines = OrderLineSerializer(many=True, read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
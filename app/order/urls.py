@@ -0,0 +1,8 @@
+from django.urls import path
+
+from app.order.views import OrderAPIView, OrderByIdAPIView
+
+urlpatterns = [
+    path('orders/', OrderAPIView.as_view()),
+    path('order/<int:pk>/', OrderByIdAPIView.as_view())
+]
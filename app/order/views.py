@@ -0,0 +1,116 @@
+from django.db.models import Prefetch
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from app.cart.models import Cart
+from app.common.pagination import KeysetPagination, pagination_parameters
+from app.order.checkout import checkout
+from app.order.models import Order, OrderLine
+from app.order.serializers import OrderSerializer
+
+order_tags = ['Orders']
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+
+
+def get_orders(user_id):
+    lines = OrderLine.objects.select_related('product').order_by('id')
+    return Order.objects.filter(user_id=user_id).prefetch_related(
+        Prefetch('lines', queryset=lines))
+
+
+class OrderAPIView(APIView):
+    """
+    Views to get user`s orders or to make an order from a cart
+    """
+    serializer_class = OrderSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering = ('-id',)
+
+    @extend_schema(
+        summary='Get orders',
+        description='View to get orders of the user page by page, the '
+                    'newest first',
+        tags=order_tags,
+        parameters=pagination_parameters
+    )
+    def get(self, request):
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(get_orders(request.user.pk),
+                                           request, view=self)
+
+        if not page:
+            return Response({'message': 'Orders not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        summary='Checkout',
+        description='View to make an order from the items of the cart. '
+                    'Prices and the address are copied to the order, '
+                    'reserved items are taken from the reservation. A '
+                    'retry with the same Idempotency-Key returns the '
+                    'order of the first request with status 200',
+        tags=order_tags,
+        parameters=[OpenApiParameter(IDEMPOTENCY_KEY_HEADER, str,
+                                     OpenApiParameter.HEADER,
+                                     description='Unique key of the '
+                                                 'checkout, up to 255 '
+                                                 'characters')]
+    )
+    def post(self, request):
+        idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        max_length = Order._meta.get_field('idempotency_key').max_length
+        if (idempotency_key is not None
+                and not 0 < len(idempotency_key) <= max_length):
+            return Response({'message': 'Invalid Idempotency-Key'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            data = serializer.validated_data
+            cart = (Cart.objects
+                    .filter(pk=data['cart_id'],
+                            memberships__user_id=request.user.pk)
+                    .first())
+            if not cart:
+                return Response({'message': 'Cart not found'},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            order, created = checkout(request.user.pk, cart,
+                                      data['address_id'], idempotency_key)
+            order = get_orders(request.user.pk).get(pk=order.pk)
+            serializer = self.serializer_class(order)
+            return Response(serializer.data,
+                            status=(status.HTTP_201_CREATED if created
+                                    else status.HTTP_200_OK))
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class OrderByIdAPIView(APIView):
+    """
+    View to get an order of the user by pk
+    """
+    serializer_class = OrderSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        summary='Get order',
+        description='View to get an order with its lines by pk',
+        tags=order_tags,
+        operation_id='get_order'
+    )
+    def get(self, request, *args, **kwargs):
+        order = get_orders(request.user.pk).filter(
+            pk=kwargs.get('pk')).first()
+
+        if not order:
+            return Response({'message': 'Order not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.serializer_class(order)
+        return Response(serializer.data, status=status.HTTP_200_OK)
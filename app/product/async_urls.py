@@ -0,0 +1,16 @@
+from django.urls import path
+
+from app.product.async_views import (CategoryAsyncView,
+                                     CategoryBySlugAsyncView,
+                                     ProductsAsyncView,
+                                     ProductBySlugAsyncView,
+                                     ProductByCategoryAsyncView)
+
+urlpatterns = [
+    path('categories/', CategoryAsyncView.as_view()),
+    path('category/<slug:slug>/', CategoryBySlugAsyncView.as_view()),
+    path('products/', ProductsAsyncView.as_view()),
+    path('product/<slug:slug>/', ProductBySlugAsyncView.as_view()),
+    path('products/<slug:category_slug>/',
+         ProductByCategoryAsyncView.as_view())
+]
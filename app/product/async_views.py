@@ -0,0 +1,200 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from app.common.cache import (aget_cache_key,
+                              aget_cached,
+                              aset_cached,
+                              cached_response,
+                              render_data)
+from app.common.pagination import KeysetPagination
+from app.product.filters import ProductFilter
+from app.product.models import Category, CategoryStats, Product
+from app.product.serializers import (CategorySerializer,
+                                     CategoryListSerializer,
+                                     ProductSerializer,
+                                     ProductListSerializer)
+
+
+def data_response(data, status_code=status.HTTP_200_OK):
+    content, content_type = render_data(data)
+    return HttpResponse(content, content_type=content_type,
+                        status=status_code)
+
+
+class AsyncReadView(View):
+    """
+    Base of async read views. Views run on the event loop under ASGI and
+    use the async ORM and cache, responses are the same as of the sync
+    views. API exceptions are returned like in DRF views
+    """
+    http_method_names = ['get', 'head', 'options']
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail
+            if not isinstance(detail, (list, dict)):
+                detail = {'detail': detail}
+            return data_response(detail, exc.status_code)
+
+
+class CategoryAsyncView(AsyncReadView):
+    """
+    View to get all categories
+    """
+    serializer_class = CategoryListSerializer
+
+    async def get(self, request):
+        key = await aget_cache_key('categories',
+                                   models=[Category, CategoryStats])
+        entry = await aget_cached(key)
+
+        if not entry:
+            categories = Category.objects.select_related('parent', 'stats')
+            categories = [category async for category in categories]
+
+            if not categories:
+                return data_response({'message': 'Categories not found'},
+                                     status.HTTP_400_BAD_REQUEST)
+
+            serializer = self.serializer_class(categories, many=True)
+            entry = await aset_cached(key, serializer.data)
+        return cached_response(request, entry)
+
+
+class CategoryBySlugAsyncView(AsyncReadView):
+    """
+    View to get a category by slug
+    """
+    serializer_class = CategorySerializer
+
+    async def get(self, request, *args, **kwargs):
+        category_slug = kwargs.get('slug')
+        key = await aget_cache_key('category', category_slug,
+                                   models=[Category])
+        entry = await aget_cached(key)
+
+        if not entry:
+            try:
+                category = await Category.objects.aget(slug=category_slug)
+            except Category.DoesNotExist:
+                return data_response({'message': f'Category with slug '
+                                                 f'{category_slug} not found'},
+                                     status.HTTP_404_NOT_FOUND)
+
+            serializer = self.serializer_class(category)
+            entry = await aset_cached(key, serializer.data)
+        return cached_response(request, entry)
+
+
+class ProductListAsyncMixin:
+    """
+    Async version of ProductListMixin
+    """
+    serializer_class = ProductSerializer
+    list_serializer_class = ProductListSerializer
+    pagination_class = KeysetPagination
+    facets = None
+
+    async def get_page(self, request, queryset):
+        request = Request(request)
+        product_filter = ProductFilter(request.query_params)
+        if product_filter.data['facets']:
+            rows = product_filter.get_facets_queryset(queryset)
+            self.facets = product_filter.get_facets(
+                [row async for row in rows])
+        queryset = product_filter.filter_queryset(queryset)
+        self.ordering = product_filter.get_ordering(self.ordering)
+
+        if settings.FAST_LIST_SERIALIZATION:
+            queryset = self.list_serializer_class.get_queryset(queryset)
+
+        self.paginator = self.pagination_class()
+        return await self.paginator.apaginate_queryset(queryset, request,
+                                                       view=self)
+
+    def get_page_response(self, page):
+        if settings.FAST_LIST_SERIALIZATION:
+            serializer = self.list_serializer_class(page)
+        else:
+            serializer = self.serializer_class(page, many=True)
+        data = self.paginator.get_paginated_data(serializer.data)
+        if self.facets is not None:
+            data['facets'] = self.facets
+        return data_response(data)
+
+
+class ProductsAsyncView(ProductListAsyncMixin, AsyncReadView):
+    """
+    View to get all products page by page
+    """
+    ordering = ('id',)
+
+    async def get(self, request):
+        products = Product.objects.select_related('category')
+        page = await self.get_page(request, products)
+
+        if not page:
+            return data_response({'message': 'Products not found'},
+                                 status.HTTP_404_NOT_FOUND)
+
+        return self.get_page_response(page)
+
+
+class ProductByCategoryAsyncView(ProductListAsyncMixin, AsyncReadView):
+    """
+    View to get products of a category and its descendants page by page
+    """
+    ordering = ('category_id', 'id')
+
+    async def get(self, request, *args, **kwargs):
+        category_slug = kwargs.get('category_slug')
+
+        try:
+            category = await Category.objects.aget(slug=category_slug)
+        except Category.DoesNotExist:
+            return data_response({'message': f'Category with slug '
+                                             f'{category_slug} not found'},
+                                 status.HTTP_404_NOT_FOUND)
+
+        products = (Product.objects.select_related('category')
+                    .filter(category__in=category.get_descendants()))
+        page = await self.get_page(request, products)
+
+        if not page:
+            return data_response({'message': f'Products with category slug '
+                                             f'{category} not found'},
+                                 status.HTTP_400_BAD_REQUEST)
+
+        return self.get_page_response(page)
+
+
+class ProductBySlugAsyncView(AsyncReadView):
+    """
+    View to get a product by slug
+    """
+    serializer_class = ProductSerializer
+
+    async def get(self, request, *args, **kwargs):
+        product_slug = kwargs.get('slug')
+        key = await aget_cache_key('product', product_slug,
+                                   models=[Category, Product])
+        entry = await aget_cached(key)
+
+        if not entry:
+            try:
+                product = await (Product.objects.select_related('category')
+                                 .aget(slug=product_slug))
+            except Product.DoesNotExist:
+                return data_response({'message': f'Product with slug '
+                                                 f'{product_slug} not found'},
+                                     status.HTTP_404_NOT_FOUND)
+
+            serializer = self.serializer_class(product)
+            entry = await aset_cached(key, serializer.data)
+        return cached_response(request, entry)
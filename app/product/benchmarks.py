@@ -0,0 +1,56 @@
+import random
+import time
+from decimal import Decimal
+
+from app.product.models import Category, Product
+
+
+def create_catalog(categories, products, seed=0):
+    """
+    Creates a synthetic catalog with bulk inserts, slugs are prepared in
+    advance so no uniqueness queries are made. Returned created categories
+    """
+    generator = random.Random(seed)
+
+    category_objs = []
+    for index in range(categories):
+        category = Category(
+            name=f'Benchmark category {index}',
+            slug=f'benchmark-category-{index}',
+            description=f'Synthetic category number {index} with products '
+                        f'for the benchmark of the catalog endpoints'
+        )
+        category._slug_prepared = True
+        category_objs.append(category)
+    category_objs = Category.objects.bulk_create(category_objs)
+
+    product_objs = []
+    for index in range(products):
+        product = Product(
+            name=f'Benchmark product {index}',
+            slug=f'benchmark-product-{index}',
+            category=category_objs[index % categories],
+            price=Decimal(generator.randint(100, 1000000)) / 100,
+            sale=generator.choice([0, 0, 5, 10, 15, 33, 50]),
+            image1=f'products_image/benchmark-{index}.jpg',
+            image2=(f'products_image/benchmark-{index}-2.jpg'
+                    if index % 2 else None)
+        )
+        product._slug_prepared = True
+        product_objs.append(product)
+    Product.objects.bulk_create(product_objs, batch_size=1000)
+
+    return category_objs
+
+
+def measure(func, repeat):
+    """
+    Returned the best time of func in seconds out of repeat runs
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
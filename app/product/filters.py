@@ -0,0 +1,167 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, Q, Subquery
+from rest_framework import serializers
+
+from app.product.models import Category
+
+
+class ProductFilterSerializer(serializers.Serializer):
+    category = serializers.SlugField(required=False,
+                                     help_text='Slug of a category, '
+                                               'products of its '
+                                               'descendants are included')
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2,
+                                         min_value=Decimal(0),
+                                         required=False)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2,
+                                         min_value=Decimal(0),
+                                         required=False)
+    on_sale = serializers.BooleanField(required=False, allow_null=True,
+                                       default=None)
+    name = serializers.CharField(max_length=150, required=False,
+                                 help_text='Beginning of the product name')
+    ordering = serializers.ChoiceField(choices=['price', '-price'],
+                                       required=False)
+    facets = serializers.BooleanField(default=False,
+                                      help_text='Return facet counts of '
+                                                'categories, prices and '
+                                                'sales')
+
+
+def get_buckets(bounds):
+    """
+    Returned (min, max) ranges between the bounds, max is excluded and
+    None for the last range
+    """
+    return list(zip(bounds, [*bounds[1:], None]))
+
+
+def get_range_condition(field, low, high):
+    condition = Q(**{f'{field}__gte': low})
+    if high is not None:
+        condition &= Q(**{f'{field}__lt': high})
+    return condition
+
+
+class ProductFilter:
+    """
+    Filters and ordering of product lists by query parameters. Prices are
+    compared with the stored final price, so everything runs in SQL.
+    Facets of the filtered products are counted by one grouped query,
+    every facet is counted with all filters except its own, so a client
+    sees how many products another choice would give
+
+    Methods:
+        filter_queryset(): Returned filtered products
+        get_ordering(): Returned ordering for the keyset pagination
+        get_facets_queryset(): Returned rows of the facet counts
+        get_facets(): Returned facets built from the rows
+    """
+
+    serializer_class = ProductFilterSerializer
+    orderings = {
+        'price': ('final_price', 'id'),
+        '-price': ('-final_price', '-id')
+    }
+
+    def __init__(self, query_params):
+        serializer = self.serializer_class(data=query_params)
+        serializer.is_valid(raise_exception=True)
+        self.data = serializer.validated_data
+        self.price_buckets = get_buckets(settings.PRODUCT_PRICE_FACETS)
+        self.sale_buckets = get_buckets(settings.PRODUCT_SALE_FACETS)
+
+    def get_conditions(self):
+        """
+        Returned conditions of the filters by facets, the name filter has
+        no facet
+        """
+        data = self.data
+        conditions = {}
+
+        if 'category' in data:
+            # Paths of the subtree start with the path of the category
+            path = Category.objects.filter(slug=data['category'])
+            conditions['category'] = Q(category__in=Category.objects.filter(
+                path__startswith=Subquery(path.values('path')[:1])))
+
+        price = Q()
+        if 'min_price' in data:
+            price &= Q(final_price__gte=data['min_price'])
+        if 'max_price' in data:
+            price &= Q(final_price__lte=data['max_price'])
+        if price:
+            conditions['price'] = price
+
+        if data.get('on_sale') is not None:
+            conditions['sale'] = (Q(sale__gt=0) if data['on_sale']
+                                  else Q(sale=0))
+        if 'name' in data:
+            conditions['name'] = Q(name__istartswith=data['name'])
+        return conditions
+
+    def filter_queryset(self, queryset):
+        for condition in self.get_conditions().values():
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def get_ordering(self, default):
+        return self.orderings.get(self.data.get('ordering'), default)
+
+    def get_facets_queryset(self, queryset):
+        """
+        Returned one row per category of the unfiltered queryset with
+        conditional counts of every facet value
+        """
+        conditions = self.get_conditions()
+
+        def count(facet, condition=Q()):
+            others = [value for name, value in conditions.items()
+                      if name != facet]
+            condition = Q(*others) & condition
+            return Count('id', filter=condition if condition else None)
+
+        aggregates = {'category_count': count('category')}
+        for index, (low, high) in enumerate(self.price_buckets):
+            aggregates[f'price_{index}'] = count(
+                'price', get_range_condition('final_price', low, high))
+        for index, (low, high) in enumerate(self.sale_buckets):
+            aggregates[f'sale_{index}'] = count(
+                'sale', get_range_condition('sale', low, high))
+
+        return (queryset.values('category_id', 'category__name',
+                                'category__slug')
+                .annotate(**aggregates).order_by())
+
+    def get_facets(self, rows):
+        categories = sorted(
+            ({'name': row['category__name'],
+              'slug': row['category__slug'],
+              'count': row['category_count']}
+             for row in rows if row['category_count']),
+            key=lambda category: (-category['count'], category['name']))
+
+        def get_bucket_counts(facet, buckets, field):
+            return [
+                {'min': field.to_representation(low),
+                 'max': None if high is None else field.to_representation(
+                     high),
+                 'count': sum(row[f'{facet}_{index}'] for row in rows)}
+                for index, (low, high) in enumerate(buckets)
+            ]
+
+        price_field = self.serializer_class().fields['min_price']
+        sale_field = serializers.IntegerField()
+        return {
+            'category': categories,
+            'price': get_bucket_counts('price', self.price_buckets,
+                                       price_field),
+            'sale': get_bucket_counts('sale', self.sale_buckets, sale_field)
+        }
+
+
+class ProductSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
@@ -0,0 +1,198 @@
+import io
+import logging
+import posixpath
+import queue
+import threading
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from PIL import Image, ImageOps
+
+from app.product.models import Product
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FIELDS = ('image1', 'image2', 'image3')
+VARIANTS_DIRECTORY = 'products_image/variants'
+
+tasks = queue.Queue(maxsize=settings.PRODUCT_IMAGE_QUEUE_SIZE)
+worker = None
+worker_lock = threading.Lock()
+
+
+def get_formats():
+    """
+    Returned save options of PRODUCT_IMAGE_FORMATS which the installed
+    Pillow can write, AVIF needs Pillow built with libavif
+    """
+    extensions = Image.registered_extensions()
+    return {
+        image_format: options
+        for image_format, options in settings.PRODUCT_IMAGE_FORMATS.items()
+        if extensions.get(f'.{image_format}') in Image.SAVE
+    }
+
+
+def save_formats(image, formats, storage):
+    """
+    Saves the image in every format and returned the names by formats
+    """
+    names = {}
+    for image_format, options in formats.items():
+        buffer = io.BytesIO()
+        image.save(buffer, image_format.upper(), **options)
+        names[image_format] = storage.save(
+            posixpath.join(VARIANTS_DIRECTORY, f'variant.{image_format}'),
+            ContentFile(buffer.getvalue()))
+    return names
+
+
+def make_variants(name, storage=default_storage):
+    """
+    Returned variants of the image: a square thumbnail and images of
+    PRODUCT_IMAGE_WIDTHS narrower than the original, every one in all
+    formats. The original is never upscaled
+    """
+    with storage.open(name) as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image.load()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = 'A' in image.mode or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    formats = get_formats()
+    size = settings.PRODUCT_IMAGE_THUMBNAIL_SIZE
+    variants = {
+        'source': name,
+        'thumbnail': save_formats(
+            ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS),
+            formats, storage),
+        'widths': {}
+    }
+    for width in sorted(settings.PRODUCT_IMAGE_WIDTHS):
+        if width >= image.width:
+            break
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        variants['widths'][str(width)] = save_formats(resized, formats,
+                                                      storage)
+    return variants
+
+
+def build_variants(images, variants):
+    """
+    Returned image_variants of a product with the images {field: name}.
+    Variants of unchanged images are kept, an image which can not be read
+    is skipped and logged. Needs no database, so it runs in other
+    processes too
+    """
+    result = {}
+    for field, name in images.items():
+        if not name:
+            continue
+        current = variants.get(field)
+        if current and current['source'] == name:
+            result[field] = current
+            continue
+        try:
+            result[field] = make_variants(name)
+        except (OSError, ValueError) as e:
+            logger.warning('Variants of %s are not made: %s', name, e)
+    return result
+
+
+def is_stale(images, variants):
+    """
+    Returned whether some image has no variants of its current file
+    """
+    return any(
+        name and (variants.get(field) or {}).get('source') != name
+        for field, name in images.items()
+    )
+
+
+def save_variants(product_id, images, variants):
+    """
+    Saves variants when the images of the product are still the same.
+    Returned whether they were saved
+    """
+    return bool(Product.objects.unfiltered()
+                .filter(pk=product_id, **images)
+                .update(image_variants=variants))
+
+
+def process_product(product_id):
+    product = (Product.objects.unfiltered().filter(pk=product_id)
+               .values(*IMAGE_FIELDS, 'image_variants').first())
+    if product is None:
+        return
+
+    images = {field: product[field] for field in IMAGE_FIELDS}
+    variants = build_variants(images, product['image_variants'])
+    if variants != product['image_variants']:
+        save_variants(product_id, images, variants)
+
+
+def work():
+    """
+    Loop of the worker thread, processes products from the queue
+    """
+    while True:
+        product_id = tasks.get()
+        try:
+            process_product(product_id)
+        except Exception:
+            logger.exception('Variants of product %s are not made',
+                             product_id)
+        finally:
+            connections.close_all()
+            tasks.task_done()
+
+
+def start_worker():
+    global worker
+
+    with worker_lock:
+        if worker is None or not worker.is_alive():
+            worker = threading.Thread(target=work, name='product-images',
+                                      daemon=True)
+            worker.start()
+
+
+def enqueue_variants(product_id):
+    """
+    Adds the product to the queue of the worker thread, which stands in
+    for a task queue. When the queue is full the product is left for the
+    generate_image_variants command
+    """
+    start_worker()
+    try:
+        tasks.put_nowait(product_id)
+    except queue.Full:
+        logger.warning('Image queue is full, variants of product %s are '
+                       'left for generate_image_variants', product_id)
+
+
+def get_variant_urls(variants, images, storage=default_storage):
+    """
+    Returned URLs of the variants of the current images, variants of a
+    replaced image are not returned until they are remade
+    """
+    def get_urls(names):
+        return {image_format: storage.url(name)
+                for image_format, name in names.items()}
+
+    data = {}
+    for field, name in images.items():
+        current = variants.get(field)
+        if not name or not current or current['source'] != name:
+            continue
+        data[field] = {
+            'thumbnail': get_urls(current['thumbnail']),
+            'widths': {width: get_urls(names)
+                       for width, names in current['widths'].items()}
+        }
+    return data
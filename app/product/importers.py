@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from autoslug.utils import crop_slug
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from app.product.models import Category, Product
+from app.product.serializers import ProductImportSerializer
+
+
+def read_csv(file):
+    """
+    Returned rows of a CSV file one by one. Empty cells are dropped, so
+    the serializer defaults are used for them
+    """
+    for row in csv.DictReader(file):
+        yield {key: value for key, value in row.items() if value != ''}
+
+
+def read_jsonl(file):
+    """
+    Returned rows of a JSON lines file one by one. A broken line is
+    returned as the error, so it is reported without stopping the import
+    """
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+readers = {
+    'csv': read_csv,
+    'jsonl': read_jsonl
+}
+
+
+def read_upload(file, file_format):
+    """
+    Returned rows of an uploaded file without reading it into memory
+    """
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    return readers[file_format](text)
+
+
+class ProductImporter:
+    """
+    Bulk import of products
+
+    Rows are validated and inserted in batches. Category slugs are
+    resolved with one query per batch and product slugs are generated in
+    memory against the set of existing slugs, so every batch costs two
+    queries and one bulk INSERT in its own transaction. Invalid rows are
+    reported and skipped, they do not abort the batch
+
+    Methods:
+        run(): Imports rows and returned the report
+    """
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.slug_field = Product._meta.get_field('slug')
+        self.slugs = set()
+        self.created = 0
+        self.errors = []
+
+    def run(self, rows):
+        self.slugs = set(Product.objects.unfiltered()
+                         .values_list('slug', flat=True).iterator())
+
+        rows = enumerate(rows, start=1)
+        while batch := list(islice(rows, self.batch_size)):
+            self.import_batch(batch)
+
+        self.errors.sort(key=lambda error: error['row'])
+        return {'created': self.created, 'errors': self.errors}
+
+    def import_batch(self, batch):
+        rows = []
+        for number, row in batch:
+            if not isinstance(row, dict):
+                self.add_error(number, {'row': [str(row)]})
+                continue
+
+            serializer = ProductImportSerializer(data=row)
+            if serializer.is_valid():
+                rows.append((number, serializer.validated_data))
+            else:
+                self.add_error(number, serializer.errors)
+
+        category_slugs = {data['category_slug'] for _, data in rows}
+        categories = Category.objects.in_bulk(category_slugs,
+                                              field_name='slug')
+
+        numbers = []
+        products = []
+        for number, data in rows:
+            category_slug = data.pop('category_slug')
+            category = categories.get(category_slug)
+
+            if not category:
+                self.add_error(number, {'category_slug': [
+                    f'Category with slug {category_slug} not found']})
+                continue
+
+            product = Product(category=category, **data)
+            product.slug = self.get_unique_slug(product.name)
+            product._slug_prepared = True
+            numbers.append(number)
+            products.append(product)
+
+        if not products:
+            return
+
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create(products)
+        except DatabaseError as e:
+            self.slugs.difference_update(product.slug for product in products)
+            for number in numbers:
+                self.add_error(number, {'non_field_errors': [str(e)]})
+        else:
+            self.created += len(products)
+
+    def get_unique_slug(self, name):
+        """
+        Returned a slug in the same way as AutoSlugField, but checks the
+        uniqueness against the prefetched slugs instead of the database
+        """
+        field = self.slug_field
+        original_slug = slug = (crop_slug(field, field.slugify(name))
+                                or Product._meta.model_name)
+
+        index = 1
+        while slug in self.slugs:
+            index += 1
+            tail = f'{field.index_sep}{index}'
+            slug = f'{original_slug[:field.max_length - len(tail)]}{tail}'
+
+        self.slugs.add(slug)
+        return slug
+
+    def add_error(self, number, errors):
+        self.errors.append({'row': number, 'errors': errors})
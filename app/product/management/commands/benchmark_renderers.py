@@ -0,0 +1,58 @@
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from app.common.parsers import ORJSONParser, orjson
+from app.common.renderers import ORJSONRenderer
+from app.product.benchmarks import create_catalog, measure
+from app.product.models import Product
+from app.product.serializers import ProductListSerializer
+
+
+class Command(BaseCommand):
+    help = ('Compare JSONRenderer/JSONParser with ORJSONRenderer/'
+            'ORJSONParser on product list payloads, the catalog is rolled '
+            'back at the end')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed')
+
+        with transaction.atomic():
+            create_catalog(options['categories'], options['products'])
+            self.run(options['repeat'])
+            transaction.set_rollback(True)
+
+    def run(self, repeat):
+        products = Product.objects.filter(slug__startswith='benchmark-')
+        data = {'next': None, 'results': ProductListSerializer(
+            ProductListSerializer.get_queryset(products.order_by('id'))
+        ).data}
+
+        content = JSONRenderer().render(data)
+        if ORJSONRenderer().render(data) != content:
+            raise CommandError('ORJSONRenderer output differs '
+                               'from JSONRenderer')
+
+        megabytes = len(content) / 1024 / 1024
+        self.stdout.write(f'Payload: {megabytes:.2f} MB')
+        for name, func in [
+            ('JSONRenderer', lambda: JSONRenderer().render(data)),
+            ('ORJSONRenderer', lambda: ORJSONRenderer().render(data)),
+            ('JSONParser', lambda: self.parse(JSONParser(), content)),
+            ('ORJSONParser', lambda: self.parse(ORJSONParser(), content))
+        ]:
+            seconds = measure(func, repeat)
+            self.stdout.write(f'{name}: {seconds * 1000:.1f} ms, '
+                              f'{megabytes / seconds:.0f} MB/s')
+
+    def parse(self, parser, content):
+        return parser.parse(BytesIO(content), parser_context={})
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from app.product.benchmarks import create_catalog, measure
+from app.product.models import Product
+from app.product.serializers import ProductSerializer, ProductListSerializer
+
+
+class Command(BaseCommand):
+    help = ('Compare ProductSerializer with ProductListSerializer on a '
+            'synthetic catalog, the catalog is rolled back at the end')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_catalog(options['categories'], options['products'])
+            self.run(options['repeat'])
+            transaction.set_rollback(True)
+
+    def run(self, repeat):
+        products = (Product.objects.select_related('category')
+                    .filter(slug__startswith='benchmark-').order_by('id'))
+        instances = list(products)
+        rows = list(ProductListSerializer.get_queryset(products))
+
+        renderer = JSONRenderer()
+        expected = renderer.render(
+            ProductSerializer(instances, many=True).data)
+        if renderer.render(ProductListSerializer(rows).data) != expected:
+            raise CommandError('ProductListSerializer output differs '
+                               'from ProductSerializer')
+
+        results = {
+            'ProductSerializer': measure(
+                lambda: ProductSerializer(instances, many=True).data, repeat),
+            'ProductListSerializer': measure(
+                lambda: ProductListSerializer(rows).data, repeat)
+        }
+
+        for name, seconds in results.items():
+            self.stdout.write(f'{name}: {seconds * 1000:.1f} ms, '
+                              f'{len(rows) / seconds:.0f} rows/s')
+        speedup = (results['ProductSerializer']
+                   / results['ProductListSerializer'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Output is identical, speedup {speedup:.1f}x'))
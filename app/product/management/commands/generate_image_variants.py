@@ -0,0 +1,55 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app.product.images import (IMAGE_FIELDS,
+                                build_variants,
+                                is_stale,
+                                save_variants)
+from app.product.models import Product
+
+
+class Command(BaseCommand):
+    help = ('Make variants of product images which have none, images are '
+            'processed in parallel by a process pool')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--force', action='store_true',
+                            help='Remake variants of all images')
+
+    def handle(self, *args, **options):
+        products = (Product.objects.unfiltered()
+                    .values('id', *IMAGE_FIELDS, 'image_variants')
+                    .order_by('id'))
+        stale = []
+        for product in products.iterator():
+            images = {field: product[field] for field in IMAGE_FIELDS}
+            variants = {} if options['force'] else product['image_variants']
+            if is_stale(images, variants):
+                stale.append((product['id'], images, variants))
+
+        # Workers do not use the database, connections are not inherited
+        connections.close_all()
+        saved = 0
+        with ProcessPoolExecutor(max_workers=options['workers'],
+                                 initializer=django.setup) as executor:
+            batch_size = options['batch_size']
+            for start in range(0, len(stale), batch_size):
+                batch = stale[start:start + batch_size]
+                results = executor.map(build_variants,
+                                       [images for _, images, _ in batch],
+                                       [variants for _, _, variants in batch])
+                for (product_id, images, current), variants in zip(batch,
+                                                                   results):
+                    if variants != current:
+                        saved += save_variants(product_id, images, variants)
+                self.stdout.write(f'{start + len(batch)}/{len(stale)} '
+                                  f'products processed')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Variants of {saved} products are saved'))
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.product.importers import ProductImporter, readers
+
+
+class Command(BaseCommand):
+    help = 'Import products from a CSV or JSON lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+        parser.add_argument('--format', choices=readers,
+                            help='File format, by default the extension')
+        parser.add_argument('--batch-size', type=int,
+                            help='Number of products in one INSERT')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.suffix.lstrip('.')
+
+        if file_format not in readers:
+            raise CommandError(f'Unknown file format {file_format}')
+
+        importer = ProductImporter(batch_size=options['batch_size'])
+        with path.open(encoding='utf-8-sig', newline='') as file:
+            report = importer.run(readers[file_format](file))
+
+        for error in report['errors']:
+            self.stderr.write(f'Row {error["row"]}: '
+                              f'{json.dumps(error["errors"])}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {report["created"]} products, '
+            f'{len(report["errors"])} rows with errors'))
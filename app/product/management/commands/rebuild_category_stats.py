@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.product.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute product counts and price stats of all categories'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_stats()
+        self.stdout.write(self.style.SUCCESS('Category stats are rebuilt'))
@@ -0,0 +1,138 @@
+from django.db import transaction
+from django.db.models import Q
+
+from app.common.managers import IsActiveManager, IsActiveQuerySet
+from app.product import search, stats
+
+
+class ProductQuerySet(IsActiveQuerySet):
+    """
+    QuerySet for products which keeps the final_price column, the search
+    index and the category stats in sync on bulk writes
+    """
+
+    price_fields = {'price', 'sale'}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sync = True
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._sync = self._sync
+        return clone
+
+    def update(self, **kwargs):
+        fields = kwargs.keys()
+        if not self._sync or not (self.price_fields | search.INDEXED_FIELDS
+                                  | stats.STATS_FIELDS) & fields:
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            products = list(self.values_list('pk', 'category_id'))
+            pks = [pk for pk, _ in products]
+            rows = super().update(**kwargs)
+            if self.price_fields & fields:
+                self.update_final_price(pks)
+            if search.INDEXED_FIELDS & fields:
+                search.index_products(pks)
+            if stats.STATS_FIELDS & fields:
+                categories = {category_id for _, category_id in products}
+                if {'category', 'category_id'} & fields:
+                    category = kwargs.get('category', kwargs.get(
+                        'category_id'))
+                    categories.add(getattr(category, 'pk', category))
+                stats.refresh_categories_later(categories)
+        return rows
+
+    def update_final_price(self, pks):
+        products = list(self.model.objects.unfiltered()
+                        .filter(pk__in=pks).only('price', 'sale'))
+        for product in products:
+            product.final_price = product.get_price_result()
+        self.model.objects.unfiltered().bulk_update(
+            products, ['final_price'], batch_size=1000
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        for obj in objs:
+            obj.final_price = obj.get_price_result()
+        objs = super().bulk_create(objs, *args, **kwargs)
+        search.index_products([obj.pk for obj in objs if obj.pk])
+        stats.refresh_categories_later({obj.category_id for obj in objs})
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        if self.price_fields & set(fields):
+            for obj in objs:
+                obj.final_price = obj.get_price_result()
+            fields.append('final_price')
+
+        # The UPDATE queries of bulk_update set fields to CASE expressions,
+        # so they are written as they are and synced here once
+        queryset = self._chain()
+        queryset._sync = False
+        with transaction.atomic(using=self.db):
+            rows = super(ProductQuerySet, queryset).bulk_update(
+                objs, fields, *args, **kwargs)
+            if search.INDEXED_FIELDS & set(fields):
+                search.index_products([obj.pk for obj in objs])
+        if stats.STATS_FIELDS & set(fields):
+            stats.refresh_categories_later(
+                {obj.category_id for obj in objs}
+                | {getattr(obj, '_loaded_category_id', None) for obj in objs})
+        return rows
+
+
+ProductManager = IsActiveManager.from_queryset(ProductQuerySet)
+
+
+class CategoryQuerySet(IsActiveQuerySet):
+    """
+    QuerySet for categories, deactivating categories deactivates their
+    subtrees and the products of them in the same transaction
+
+    Methods:
+        get_subtrees(): Returned queryset of the categories and all their
+            descendants
+    """
+
+    def get_subtrees(self):
+        condition = Q()
+        for path in self.exclude(path='').values_list('path', flat=True):
+            condition |= Q(path__startswith=path)
+        if not condition:
+            return self.none()
+        return self.model.objects.filter(condition)
+
+    get_subtrees.queryset_only = True
+
+    def delete(self, hard_delete=False):
+        if hard_delete:
+            return super().delete(hard_delete=True)
+
+        Product = self.model._meta.get_field('products').related_model
+        with transaction.atomic(using=self.db):
+            categories = self.get_subtrees()
+            Product.objects.filter(category__in=categories).delete()
+            return IsActiveQuerySet.delete(categories)
+
+    delete.queryset_only = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Paths are set after the insert, when the ids are known. Parents
+        have to go before their children
+        """
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            new = [obj for obj in objs if obj.pk and not obj.path]
+            for obj in new:
+                obj.path = obj.get_path()
+            self.model.objects.unfiltered().bulk_update(new, ['path'],
+                                                        batch_size=1000)
+        return objs
+
+
+CategoryManager = IsActiveManager.from_queryset(CategoryQuerySet)
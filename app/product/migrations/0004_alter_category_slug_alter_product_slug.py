@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:17
+
+import app.common.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0003_alter_product_sale'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=app.common.fields.AutoSlugField(editable=False, populate_from='name', unique=True),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='slug',
+            field=app.common.fields.AutoSlugField(editable=False, populate_from='name', unique=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:22
+
+from django.db import migrations, models
+
+
+def backfill_final_price(apps, schema_editor):
+    Product = apps.get_model('product', 'Product')
+    products = Product._base_manager.only('price', 'sale').order_by('pk')
+
+    batch = []
+    for product in products.iterator(chunk_size=1000):
+        price = product.price
+        if product.sale:
+            price = round(price - (price / 100 * product.sale), 2)
+        product.final_price = price
+        batch.append(product)
+
+        if len(batch) == 1000:
+            Product._base_manager.bulk_update(batch, ['final_price'])
+            batch = []
+    Product._base_manager.bulk_update(batch, ['final_price'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0004_alter_category_slug_alter_product_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='final_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, editable=False, max_digits=10),
+        ),
+        migrations.RunPython(backfill_final_price, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def backfill_category_stats(apps, schema_editor):
+    Category = apps.get_model('product', 'Category')
+    CategoryStats = apps.get_model('product', 'CategoryStats')
+    Product = apps.get_model('product', 'Product')
+
+    rows = (Product._base_manager.filter(is_active=True)
+            .values('category_id')
+            .annotate(product_count=Count('id'),
+                      min_price=Min('final_price'),
+                      max_price=Max('final_price'),
+                      max_sale=Max('sale'))
+            .order_by())
+    stats = {row['category_id']: CategoryStats(**row) for row in rows}
+    for pk in Category._base_manager.values_list('pk', flat=True):
+        stats.setdefault(pk, CategoryStats(category_id=pk))
+    CategoryStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0008_product_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='product.category')),
+                ('product_count', models.IntegerField(default=0)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('max_sale', models.IntegerField(null=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_category_stats,
+                             migrations.RunPython.noop),
+    ]
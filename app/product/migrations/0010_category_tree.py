@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
+
+
+def backfill_path(apps, schema_editor):
+    Category = apps.get_model('product', 'Category')
+    # Existing categories are roots
+    Category._base_manager.update(
+        path=Concat(Value('/'), Cast('id', CharField()), Value('/'),
+                    output_field=CharField()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0009_categorystats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='product.category'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_path, migrations.RunPython.noop),
+    ]
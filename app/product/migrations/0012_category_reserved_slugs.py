@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:27
+
+import app.common.fields
+from django.db import migrations
+
+RESERVED_SLUGS = ['bulk', 'import', 'search']
+
+
+def rename_reserved_slugs(apps, schema_editor):
+    Category = apps.get_model('product', 'Category')
+    categories = Category._base_manager
+    for category in categories.filter(slug__in=RESERVED_SLUGS):
+        index = 2
+        while categories.filter(slug=f'{category.slug}-{index}').exists():
+            index += 1
+        categories.filter(pk=category.pk).update(
+            slug=f'{category.slug}-{index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0011_product_stock'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=app.common.fields.AutoSlugField(editable=False, populate_from='name', reserved=('bulk', 'import', 'search'), unique=True),
+        ),
+        migrations.RunPython(rename_reserved_slugs,
+                             migrations.RunPython.noop),
+    ]
@@ -1,34 +1,122 @@
-from autoslug import AutoSlugField
+from decimal import Decimal
+
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat, Substr
 
+from app.common.fields import AutoSlugField
 from app.common.models import BaseModel
+from app.product import stats
+from app.product.managers import CategoryManager, ProductManager
+
+
+def get_short_description(description):
+    """
+    Returned first 50 characters of the description
+    """
+    if not description or len(description) <= 50:
+        return description
+    if description[50] in ['.', '!', '?']:
+        return description[:51]
+    if description[50] == ' ':
+        return f'{description[:50]}...'
+    return f'{description[:51]}...'
 
 
 class Category(BaseModel):
     """
-    Category model for products
+    Category model for products. Categories are a tree stored as
+    materialized paths, so a subtree is one prefix query on an index
 
     Fields:
         name (str): Category name
         description (str): Category description
         slug (str): Category URL-address
+        parent (ForeignKey): Parent category, None for a root
+        path (str): Ids of the ancestors and the category, like /1/5/12/
 
     Methods:
         get_short_description(): Returned short category description
+        get_path(): Returned the path by the parent
+        get_descendants(): Returned queryset of the subtree
+        is_descendant_of(): Returned whether the category is in the
+            subtree of other category
         __str__(): Returned category name
     """
 
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(null=True)
-    slug = AutoSlugField(populate_from='name', unique=True)
+    # Slugs of the product routes which would shadow the category
+    slug = AutoSlugField(populate_from='name', unique=True,
+                         reserved=['bulk', 'import', 'search'])
+    parent = models.ForeignKey('self',
+                               on_delete=models.CASCADE,
+                               null=True,
+                               related_name='children')
+    path = models.CharField(max_length=255, db_index=True, default='',
+                            editable=False)
+
+    objects = CategoryManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        category = super().from_db(db, field_names, values)
+        # The parent the category was loaded with, the subtree is moved
+        # when the parent is changed
+        category._loaded_parent_id = category.__dict__.get('parent_id')
+        return category
 
     def get_short_description(self):
-        if self.description[50] in ['.', '!', '?']:
-            return self.description[:51]
-        if self.description[50] == ' ':
-            return f'{self.description[:50]}...'
-        return f'{self.description[:51]}...'
+        return get_short_description(self.description)
+
+    def get_path(self):
+        parent_path = self.parent.path if self.parent_id else '/'
+        return f'{parent_path}{self.pk}/'
+
+    def get_descendants(self, include_self=True):
+        categories = Category.objects.filter(path__startswith=self.path)
+        if not include_self:
+            categories = categories.exclude(pk=self.pk)
+        return categories
+
+    def is_descendant_of(self, other):
+        return bool(other.path) and self.path.startswith(other.path)
+
+    def save(self, *args, **kwargs):
+        moved = (not self.path
+                 or self.parent_id != getattr(self, '_loaded_parent_id',
+                                              self.parent_id))
+        if not moved:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.move_subtree()
+
+    def move_subtree(self):
+        """
+        Sets the path of the category by its parent and rewrites the
+        paths of all descendants with one UPDATE. Stats of the old and the
+        new ancestors are recomputed after commit
+        """
+        old_path, new_path = self.path, self.get_path()
+        if self.parent_id and self.parent.is_descendant_of(self):
+            raise ValueError(f'Category {self} can not be moved into '
+                             f'its subtree')
+
+        categories = Category.objects.unfiltered()
+        if old_path:
+            categories.filter(path__startswith=old_path).update(
+                path=Concat(Value(new_path),
+                            Substr('path', len(old_path) + 1),
+                            output_field=CharField()))
+            stats.refresh_categories_later(stats.get_path_ids(old_path)
+                                           + stats.get_path_ids(new_path))
+        else:
+            categories.filter(pk=self.pk).update(path=new_path)
+        self.path = new_path
+        self._loaded_parent_id = self.parent_id
 
     def __str__(self):
         return self.name
@@ -44,6 +132,14 @@ class Product(BaseModel):
         price (DecimalField): Product price
         sale (int): Product sale
         image1, image2, image3 (ImageField): Product images
+        final_price (DecimalField): Price with the discount, it is
+                                    stored for filtering and ordering
+        image_variants (JSONField): Names of the thumbnails and resized
+                                    images made from image1, image2 and
+                                    image3 by the image worker
+        stock (int): Quantity in stock, None when the stock of the product
+                     is not tracked. It is taken by reservations with a
+                     conditional UPDATE, see app.product.stock
 
     Methods:
         get_price_result(): Returns the final price of the product taking
@@ -63,11 +159,74 @@ class Product(BaseModel):
     image1 = models.ImageField(upload_to='products_image')
     image2 = models.ImageField(upload_to='products_image', null=True)
     image3 = models.ImageField(upload_to='products_image', null=True)
+    final_price = models.DecimalField(max_digits=10,
+                                      decimal_places=2,
+                                      default=0,
+                                      editable=False)
+    image_variants = models.JSONField(default=dict, editable=False)
+    stock = models.PositiveIntegerField(null=True, blank=True)
+
+    objects = ProductManager()
+
+    class Meta:
+        indexes = [
+            # Active products of a category in the keyset order
+            models.Index(fields=['category', 'id'],
+                         condition=models.Q(is_active=True),
+                         name='product_active_category_idx'),
+            # Active products in the order by price
+            models.Index(fields=['final_price', 'id'],
+                         condition=models.Q(is_active=True),
+                         name='product_active_price_idx')
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        product = super().from_db(db, field_names, values)
+        # The category the product was loaded with, the stats of both
+        # categories are updated when the product is moved
+        product._loaded_category_id = product.__dict__.get('category_id')
+        return product
 
     def get_price_result(self):
+        price = Decimal(str(self.price))
         if self.sale:
-            return round(self.price - (self.price / 100 * self.sale), 2)
-        return self.price
+            return round(price - (price / 100 * self.sale), 2)
+        return price
+
+    def save(self, *args, **kwargs):
+        self.final_price = self.get_price_result()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'price', 'sale'} & {*update_fields}:
+            kwargs['update_fields'] = {*update_fields, 'final_price'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
+
+
+class CategoryStats(models.Model):
+    """
+    Summary of the active products of a category and all its
+    descendants, like the category filter of products. It is updated on
+    every write of products and move of categories and rebuilt by the
+    rebuild_category_stats command
+
+    Fields:
+        category (OneToOneField): Category of the stats
+        product_count (int): Number of active products in the subtree
+        min_price, max_price (DecimalField): Range of final prices
+        max_sale (int): Biggest sale
+    """
+    category = models.OneToOneField(Category,
+                                    on_delete=models.CASCADE,
+                                    primary_key=True,
+                                    related_name='stats')
+    product_count = models.IntegerField(default=0)
+    min_price = models.DecimalField(max_digits=10,
+                                    decimal_places=2,
+                                    null=True)
+    max_price = models.DecimalField(max_digits=10,
+                                    decimal_places=2,
+                                    null=True)
+    max_sale = models.IntegerField(null=True)
@@ -0,0 +1,188 @@
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+INDEX_TABLE = 'product_search'
+INDEXED_FIELDS = {'name', 'category', 'category_id', 'is_active'}
+BATCH_SIZE = 500
+
+
+def get_terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+def batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+class SQLiteSearchBackend:
+    """
+    Search index in the FTS5 virtual table, rowid of the table is the
+    product id. Results are ranked with bm25, matches in the product name
+    weigh more than matches in the category
+    """
+
+    create_sql = [
+        f'CREATE VIRTUAL TABLE {INDEX_TABLE} USING fts5('
+        f'name, category_name, category_description, '
+        f"tokenize='unicode61 remove_diacritics 2')"
+    ]
+    drop_sql = [f'DROP TABLE IF EXISTS {INDEX_TABLE}']
+    insert_sql = (
+        f'INSERT INTO {INDEX_TABLE} '
+        f'(rowid, name, category_name, category_description) '
+        f'SELECT p.id, p.name, c.name, c.description '
+        f'FROM product_product p '
+        f'JOIN product_category c ON c.id = p.category_id '
+        f'WHERE p.is_active'
+    )
+    delete_sql = f'DELETE FROM {INDEX_TABLE} WHERE rowid IN ({{}})'
+    search_sql = (
+        f'SELECT rowid FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH %s '
+        f'ORDER BY bm25({INDEX_TABLE}, 10.0, 4.0, 1.0) LIMIT %s'
+    )
+
+    def create(self, cursor):
+        for sql in self.create_sql:
+            cursor.execute(sql)
+
+    def drop(self, cursor):
+        for sql in self.drop_sql:
+            cursor.execute(sql)
+
+    def rebuild(self, cursor):
+        cursor.execute(f'DELETE FROM {INDEX_TABLE}')
+        cursor.execute(self.insert_sql)
+
+    def index(self, cursor, product_ids):
+        for ids in batches(product_ids):
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(self.delete_sql.format(placeholders), ids)
+            cursor.execute(f'{self.insert_sql} AND p.id IN ({placeholders})',
+                           ids)
+
+    def get_query(self, terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, cursor, terms, limit):
+        cursor.execute(self.search_sql, [self.get_query(terms), limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class PostgreSQLSearchBackend(SQLiteSearchBackend):
+    """
+    Search index in a table of tsvector documents with a GIN index.
+    Results are ranked with ts_rank, the product name has weight A and
+    the category name and description have weights B and C
+    """
+
+    create_sql = [
+        f'CREATE TABLE {INDEX_TABLE} ('
+        f'product_id bigint PRIMARY KEY '
+        f'REFERENCES product_product (id) ON DELETE CASCADE '
+        f'DEFERRABLE INITIALLY DEFERRED, '
+        f'document tsvector NOT NULL)',
+        f'CREATE INDEX {INDEX_TABLE}_document '
+        f'ON {INDEX_TABLE} USING GIN (document)'
+    ]
+    delete_sql = f'DELETE FROM {INDEX_TABLE} WHERE product_id IN ({{}})'
+    search_sql = (
+        f'SELECT product_id FROM {INDEX_TABLE}, '
+        f'to_tsquery(%s::regconfig, %s) query '
+        f'WHERE document @@ query '
+        f'ORDER BY ts_rank(document, query) DESC LIMIT %s'
+    )
+
+    @property
+    def insert_sql(self):
+        config = settings.SEARCH_CONFIG
+        return (
+            f'INSERT INTO {INDEX_TABLE} (product_id, document) '
+            f"SELECT p.id, "
+            f"setweight(to_tsvector('{config}', p.name), 'A') || "
+            f"setweight(to_tsvector('{config}', c.name), 'B') || "
+            f"setweight(to_tsvector('{config}', "
+            f"coalesce(c.description, '')), 'C') "
+            f'FROM product_product p '
+            f'JOIN product_category c ON c.id = p.category_id '
+            f'WHERE p.is_active'
+        )
+
+    def get_query(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search(self, cursor, terms, limit):
+        cursor.execute(self.search_sql,
+                       [settings.SEARCH_CONFIG, self.get_query(terms), limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class FallbackSearchBackend:
+    """
+    Search without an index for other databases
+    """
+
+    def create(self, cursor):
+        pass
+
+    drop = rebuild = create
+
+    def index(self, cursor, product_ids):
+        pass
+
+    def search(self, cursor, terms, limit):
+        Product = apps.get_model('product', 'Product')
+        condition = Q()
+        for term in terms:
+            condition &= (Q(name__icontains=term)
+                          | Q(category__name__icontains=term))
+        products = Product.objects.filter(condition).order_by('id')
+        return list(products.values_list('id', flat=True)[:limit])
+
+
+backends = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend
+}
+
+
+def get_backend(vendor=None):
+    return backends.get(vendor or connection.vendor, FallbackSearchBackend)()
+
+
+def index_products(product_ids):
+    """
+    Updates the index for products, inactive products are removed
+    """
+    if not product_ids:
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        get_backend().index(cursor, product_ids)
+
+
+def index_category(category_id):
+    Product = apps.get_model('product', 'Product')
+    index_products(Product.objects.unfiltered()
+                   .filter(category_id=category_id)
+                   .values_list('id', flat=True))
+
+
+def rebuild_index():
+    with connection.cursor() as cursor:
+        get_backend().rebuild(cursor)
+
+
+def search_products(query, limit):
+    """
+    Returned ids of products matching the query, best matches first
+    """
+    terms = get_terms(query)
+    if not terms:
+        return []
+    with connection.cursor() as cursor:
+        return get_backend().search(cursor, terms, limit)
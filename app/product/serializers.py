@@ -1,15 +1,74 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 
+from app.common.instrumentation import measure_serializer
+from app.common.serializers import TimedSerializer
+from app.product.filters import ProductFilterSerializer
+from app.product.images import IMAGE_FIELDS, get_variant_urls
+from app.product.models import (Category,
+                                CategoryStats,
+                                Product,
+                                get_short_description)
 
-class CategorySerializer(serializers.Serializer):
+
+class ShortDescriptionField(serializers.CharField):
+    """
+    Description which is written in full and read shortened
+    """
+
+    def to_representation(self, value):
+        return get_short_description(super().to_representation(value))
+
+
+class CategorySerializer(TimedSerializer):
     name = serializers.CharField(max_length=100)
-    description = serializers.CharField(allow_null=True,
-                                        source='get_short_description')
+    description = ShortDescriptionField(allow_null=True)
     slug = serializers.SlugField(read_only=True)
+    parent_slug = serializers.SlugField(write_only=True, required=False,
+                                        allow_null=True)
+
+    def validate(self, attrs):
+        if 'parent_slug' in attrs:
+            parent_slug = attrs.pop('parent_slug')
+            if parent_slug is None:
+                attrs['parent'] = None
+                return attrs
+            try:
+                attrs['parent'] = Category.objects.get(slug=parent_slug)
+            except Category.DoesNotExist:
+                raise ValidationError({'parent_slug': [
+                    f'Category with slug {parent_slug} not found']})
+        return attrs
+
+
+class CategoryStatsSerializer(serializers.Serializer):
+    product_count = serializers.IntegerField()
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    max_sale = serializers.IntegerField()
+
+
+class CategoryListSerializer(CategorySerializer):
+    """
+    Category with the slug of its parent and the stats of its products.
+    Categories have to be fetched with select_related('parent', 'stats'),
+    a category without the stats row has no products
+    """
+    parent = serializers.SlugField(read_only=True, source='parent.slug',
+                                   allow_null=True)
+    stats = serializers.SerializerMethodField()
+
+    @extend_schema_field(CategoryStatsSerializer)
+    def get_stats(self, category):
+        stats = getattr(category, 'stats', None)
+        if stats is None:
+            stats = CategoryStats(category=category)
+        return CategoryStatsSerializer(stats).data
 
 
-class ProductSerializer(serializers.Serializer):
+class ProductSerializer(TimedSerializer):
     name = serializers.CharField(max_length=150)
     slug = serializers.SlugField(read_only=True)
     category_slug = serializers.CharField(write_only=True)
@@ -22,4 +81,150 @@ class ProductSerializer(serializers.Serializer):
     image2 = serializers.ImageField(allow_null=True)
     image3 = serializers.ImageField(allow_null=True)
     result_price = serializers.CharField(read_only=True,
-                                         source='get_price_result')
+                                         source='final_price')
+    image_variants = serializers.SerializerMethodField()
+    stock = serializers.IntegerField(min_value=0, allow_null=True,
+                                     required=False, write_only=True,
+                                     help_text='Quantity in stock, null '
+                                               'when it is not tracked')
+
+    @extend_schema_field(serializers.DictField())
+    def get_image_variants(self, product):
+        return get_variant_urls(product.image_variants,
+                                {field: getattr(product, field).name
+                                 for field in IMAGE_FIELDS})
+
+    def validate(self, attrs):
+        if 'category_slug' in attrs:
+            category_slug = attrs.pop('category_slug')
+            try:
+                attrs['category'] = Category.objects.get(slug=category_slug)
+            except Category.DoesNotExist:
+                raise ValidationError({'category_slug': [
+                    f'Category with slug {category_slug} not found']})
+        return attrs
+
+
+class ProductListSerializer:
+    """
+    Read-only serializer for product lists with the same output as
+    ProductSerializer(many=True). Rows are taken from .values() instead of
+    model instances, and the category dict is built once per category and
+    shared by all its products
+
+    Methods:
+        get_queryset(): Returned queryset of rows for the serializer
+        to_representation(): Returned list of products
+    """
+
+    values_fields = ('id', 'name', 'slug', 'price', 'sale', 'image1',
+                     'image2', 'image3', 'final_price', 'image_variants',
+                     'category_id', 'category__name',
+                     'category__description', 'category__slug')
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.price_field = ProductSerializer().fields['price']
+        self.storage = Product._meta.get_field('image1').storage
+
+    @classmethod
+    def get_queryset(cls, queryset):
+        return queryset.values(*cls.values_fields)
+
+    @property
+    def data(self):
+        with measure_serializer():
+            return self.to_representation()
+
+    def to_representation(self):
+        categories = {}
+        data = []
+        for row in self.rows:
+            category = categories.get(row['category_id'])
+            if category is None:
+                category = categories[row['category_id']] = {
+                    'name': row['category__name'],
+                    'description': get_short_description(
+                        row['category__description']),
+                    'slug': row['category__slug']
+                }
+
+            product = {
+                'name': row['name'],
+                'slug': row['slug'],
+                'category': category,
+                'price': self.price_field.to_representation(row['price']),
+                'sale': row['sale']
+            }
+            for field in IMAGE_FIELDS:
+                product[field] = (self.storage.url(row[field])
+                                  if row[field] else None)
+            product['result_price'] = str(row['final_price'])
+            product['image_variants'] = get_variant_urls(
+                row['image_variants'],
+                {field: row[field] for field in IMAGE_FIELDS},
+                self.storage)
+            data.append(product)
+        return data
+
+
+class ProductImportSerializer(serializers.Serializer):
+    """
+    Serializer for one row of the bulk import. Images are paths to files
+    which are already in the media storage
+    """
+    name = serializers.CharField(max_length=150)
+    category_slug = serializers.CharField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    sale = serializers.IntegerField(validators=[MaxValueValidator(100),
+                                                MinValueValidator(0)],
+                                    default=0)
+    image1 = serializers.CharField(max_length=100, default='')
+    image2 = serializers.CharField(max_length=100, allow_null=True,
+                                   default=None)
+    image3 = serializers.CharField(max_length=100, allow_null=True,
+                                   default=None)
+
+
+class ProductImportFileSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=['csv', 'jsonl'],
+                                          required=False)
+    batch_size = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if 'file_format' not in attrs:
+            file_format = attrs['file'].name.rpartition('.')[2]
+            if file_format not in self.fields['file_format'].choices:
+                raise ValidationError({'file_format': 'Unknown file format'})
+            attrs['file_format'] = file_format
+        return attrs
+
+
+class CategoryBulkSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=['delete', 'restore'])
+    slugs = serializers.ListField(child=serializers.SlugField(),
+                                  min_length=1, max_length=1000)
+
+
+class ProductBulkSerializer(ProductFilterSerializer):
+    """
+    Serializer of the bulk action on products chosen by slugs, category
+    and price filters
+    """
+    action = serializers.ChoiceField(choices=['delete', 'restore'])
+    slugs = serializers.ListField(child=serializers.SlugField(),
+                                  min_length=1, max_length=1000,
+                                  required=False)
+    category_slug = serializers.SlugField(required=False)
+    ordering = None
+
+    selectors = ('slugs', 'category_slug', 'category', 'min_price',
+                 'max_price', 'on_sale', 'name')
+    facets = None
+
+    def validate(self, attrs):
+        if all(attrs.get(field) is None for field in self.selectors):
+            raise ValidationError(
+                f'One of {", ".join(self.selectors)} is required')
+        return attrs
@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.product import images, search, stats
+from app.product.models import Category, Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def update_product_search(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not search.INDEXED_FIELDS & update_fields:
+        return
+    search.index_products([instance.pk])
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def update_category_stats(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not stats.STATS_FIELDS & update_fields:
+        return
+    stats.refresh_categories_later(
+        {instance.category_id, getattr(instance, '_loaded_category_id', None)})
+
+
+@receiver(post_save, sender=Product)
+def update_product_images(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {*images.IMAGE_FIELDS} & update_fields:
+        return
+    product_images = {field: getattr(instance, field).name
+                      for field in images.IMAGE_FIELDS}
+    if images.is_stale(product_images, instance.image_variants):
+        transaction.on_commit(
+            lambda: images.enqueue_variants(instance.pk))
+
+
+@receiver(post_save, sender=Category)
+def update_category_search(sender, instance, **kwargs):
+    search.index_category(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def create_category_stats(sender, instance, created, **kwargs):
+    if created:
+        stats.refresh_categories_later([instance.pk])
@@ -0,0 +1,108 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+
+from app.common.cache import bump_version
+from app.product.search import BATCH_SIZE
+
+# Product fields which change the stats of a category, final_price
+# changes only with price and sale
+STATS_FIELDS = {'category', 'category_id', 'price', 'sale', 'is_active'}
+AGGREGATES = {
+    'product_count': Count('id'),
+    'min_price': Min('final_price'),
+    'max_price': Max('final_price'),
+    'max_sale': Max('sale')
+}
+
+
+def get_path_ids(path):
+    """
+    Returned ids of the categories of the path, from the root
+    """
+    return [int(pk) for pk in path.strip('/').split('/') if pk]
+
+
+def add_row(stats, row):
+    stats.product_count += row['product_count']
+    for field, choose in (('min_price', min), ('max_price', max),
+                          ('max_sale', max)):
+        values = [value for value in (getattr(stats, field), row[field])
+                  if value is not None]
+        setattr(stats, field, choose(values) if values else None)
+
+
+def save_stats(paths, products):
+    """
+    Computes the stats of the categories {pk: path} from the products and
+    saves them with upserts. Active products are grouped by their
+    category with one query, every row is added to the stats of the
+    categories of its path
+    """
+    CategoryStats = apps.get_model('product', 'CategoryStats')
+
+    stats = {pk: CategoryStats(category_id=pk, product_count=0)
+             for pk in paths}
+    rows = (products.filter(is_active=True, category__is_active=True)
+            .values('category__path').annotate(**AGGREGATES).order_by())
+    for row in rows:
+        for pk in get_path_ids(row['category__path']):
+            if pk in stats:
+                add_row(stats[pk], row)
+
+    CategoryStats.objects.bulk_create(
+        stats.values(), update_conflicts=True, unique_fields=['category'],
+        update_fields=list(AGGREGATES), batch_size=BATCH_SIZE)
+    bump_version(CategoryStats)
+
+
+def refresh_categories(category_ids):
+    """
+    Recomputes the stats of the categories and of all their ancestors.
+    Stats of a category cover the active products of its subtree, like
+    the category filter of products, so only the trees touched by a
+    write are read
+    """
+    Category = apps.get_model('product', 'Category')
+    Product = apps.get_model('product', 'Product')
+
+    category_ids = {pk for pk in category_ids if pk is not None}
+    if not category_ids:
+        return
+
+    categories = Category.objects.unfiltered()
+    for path in (categories.filter(pk__in=category_ids)
+                 .values_list('path', flat=True)):
+        category_ids.update(get_path_ids(path))
+    # Deleted categories keep their stats row
+    paths = dict(categories.filter(pk__in=category_ids)
+                 .values_list('pk', 'path'))
+
+    condition = Q()
+    for root in {path_ids[0] for path_ids in map(get_path_ids,
+                                                 paths.values())
+                 if path_ids}:
+        condition |= Q(category__path__startswith=f'/{root}/')
+    products = Product.objects.unfiltered()
+    save_stats(paths, products.filter(condition) if condition
+               else products.none())
+
+
+def refresh_categories_later(category_ids):
+    """
+    Recomputes the stats after commit, so they are computed from
+    committed rows and a rollback leaves them unchanged
+    """
+    category_ids = set(category_ids)
+    transaction.on_commit(lambda: refresh_categories(category_ids))
+
+
+def rebuild_stats():
+    """
+    Recomputes the stats of all categories with one grouped query
+    """
+    Category = apps.get_model('product', 'Category')
+    Product = apps.get_model('product', 'Product')
+    save_stats(dict(Category.objects.unfiltered()
+                    .values_list('pk', 'path')),
+               Product.objects.unfiltered())
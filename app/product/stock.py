@@ -0,0 +1,57 @@
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from app.product.models import Product
+
+
+class OutOfStock(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Not enough products in stock'
+    default_code = 'out_of_stock'
+
+    def __init__(self, product_id):
+        super().__init__()
+        self.product_id = product_id
+        self.detail = {'message': str(self.default_detail),
+                       'product_id': product_id}
+
+
+def take_stock(quantities):
+    """
+    Takes {product_id: quantity} from the stock. Every product is taken by
+    UPDATE ... SET stock = stock - n WHERE stock >= n, the database locks
+    only this row until commit and checks the condition again after a
+    concurrent update, so no row is read with select_for_update and the
+    stock never goes below zero. Products are updated in the order of id,
+    so two transactions never wait for each other in a cycle. Products
+    without tracked stock are not changed.
+
+    Must be called inside a transaction, it raises OutOfStock and the
+    rollback returns what was already taken
+    """
+    # The plain manager does not bump the cache version, the stock is not
+    # in the cached responses
+    products = Product._base_manager.filter(is_active=True)
+    for product_id, quantity in sorted(quantities.items()):
+        taken = (products.filter(pk=product_id, stock__gte=quantity)
+                 .update(stock=F('stock') - quantity))
+        if not taken and not products.filter(pk=product_id,
+                                             stock__isnull=True).exists():
+            raise OutOfStock(product_id)
+
+
+def return_stock(quantities):
+    """
+    Returns {product_id: quantity} to the stock with one UPDATE
+    """
+    if not quantities:
+        return
+    Product._base_manager.filter(
+        pk__in=quantities, stock__isnull=False
+    ).update(stock=F('stock') + Case(
+        *[When(pk=product_id, then=Value(quantity))
+          for product_id, quantity in quantities.items()],
+        default=Value(0),
+        output_field=PositiveIntegerField()
+    ))
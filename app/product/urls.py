@@ -1,15 +1,23 @@
 from django.urls import path
 
 from app.product.views import (CategoryAPIView,
+                               CategoryBulkAPIView,
                                CategoryBySlugAPIView,
                                ProductsAPIView,
+                               ProductBulkAPIView,
+                               ProductImportAPIView,
+                               ProductSearchAPIView,
                                ProductBySlugAPIView,
                                ProductByCategoryAPIView)
 
 urlpatterns = [
     path('categories/', CategoryAPIView.as_view()),
+    path('categories/bulk/', CategoryBulkAPIView.as_view()),
     path('category/<slug:slug>/', CategoryBySlugAPIView.as_view()),
     path('products/', ProductsAPIView.as_view()),
+    path('products/bulk/', ProductBulkAPIView.as_view()),
+    path('products/import/', ProductImportAPIView.as_view()),
+    path('products/search/', ProductSearchAPIView.as_view()),
     path('product/<slug:slug>/', ProductBySlugAPIView.as_view()),
     path('products/<slug:category_slug>/', ProductByCategoryAPIView.as_view())
-]
\ No newline at end of file
+]
@@ -1,11 +1,29 @@
+from django.conf import settings
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, permissions
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from app.common.cache import (get_cache_key,
+                              get_cached,
+                              set_cached,
+                              cached_response)
+from app.common.pagination import KeysetPagination, pagination_parameters
 from app.common.utils import update_model
-from app.product.models import Category, Product
-from app.product.serializers import CategorySerializer, ProductSerializer
+from app.product.filters import (ProductFilter,
+                                 ProductFilterSerializer,
+                                 ProductSearchSerializer)
+from app.product.importers import ProductImporter, read_upload
+from app.product.models import Category, CategoryStats, Product
+from app.product.search import search_products
+from app.product.serializers import (CategorySerializer,
+                                     CategoryListSerializer,
+                                     CategoryBulkSerializer,
+                                     ProductSerializer,
+                                     ProductBulkSerializer,
+                                     ProductListSerializer,
+                                     ProductImportFileSerializer)
 
 category_tags = ['Category']
 products_tags = ['Products']
@@ -16,21 +34,29 @@ class CategoryAPIView(APIView):
     Views to get al create a categories
     """
     serializer_class = CategorySerializer
+    list_serializer_class = CategoryListSerializer
 
     @extend_schema(
         summary='Get categories',
-        description='View to get all categories',
-        tags=category_tags
+        description='View to get all categories with the number of '
+                    'products, their price range and the biggest sale',
+        tags=category_tags,
+        responses=CategoryListSerializer(many=True)
     )
     def get(self, request):
-        categories = Category.objects.all()
+        key = get_cache_key('categories', models=[Category, CategoryStats])
+        entry = get_cached(key)
 
-        if not categories:
-            return Response({'message': 'Categories not found'},
-                            status=status.HTTP_400_BAD_REQUEST)
+        if not entry:
+            categories = Category.objects.select_related('parent', 'stats')
 
-        serializer = self.serializer_class(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+            if not categories:
+                return Response({'message': 'Categories not found'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            serializer = self.list_serializer_class(categories, many=True)
+            entry = set_cached(key, serializer.data)
+        return cached_response(request, entry)
 
     @extend_schema(
         summary='Create a new categories',
@@ -73,15 +99,20 @@ class CategoryBySlugAPIView(APIView):
     )
     def get(self, request, *args, **kwargs):
         category_slug = kwargs.get('slug')
-        category = self.get_object(category_slug)
+        key = get_cache_key('category', category_slug, models=[Category])
+        entry = get_cached(key)
 
-        if not category:
-            return Response({'message': f'Category with slug '
-                                             f'{category_slug} not found'},
-                            status=status.HTTP_404_NOT_FOUND)
+        if not entry:
+            category = self.get_object(category_slug)
 
-        serializer = self.serializer_class(category)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+            if not category:
+                return Response({'message': f'Category with slug '
+                                            f'{category_slug} not found'},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            serializer = self.serializer_class(category)
+            entry = set_cached(key, serializer.data)
+        return cached_response(request, entry)
 
     @extend_schema(
         summary='Update a category',
@@ -90,18 +121,38 @@ class CategoryBySlugAPIView(APIView):
         operation_id='update_category'
     )
     def put(self, request, *args, **kwargs):
-        category_slug = kwargs.get('slug')
+        return self.update(request, kwargs.get('slug'))
+
+    @extend_schema(
+        summary='Partially update a category',
+        description='View to update some fields of a category by slug, '
+                    'only the changed fields are written',
+        tags=category_tags,
+        operation_id='partial_update_category'
+    )
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, kwargs.get('slug'), partial=True)
+
+    def update(self, request, category_slug, partial=False):
         category = self.get_object(category_slug)
 
         if not category:
             return Response({'message': f'Category with slug '
-                                             f'{category_slug} not found'},
+                                        f'{category_slug} not found'},
                             status=status.HTTP_404_NOT_FOUND)
 
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(data=request.data,
+                                           partial=partial)
         if serializer.is_valid(raise_exception=True):
-            category = update_model(category, serializer.validated_data)
-            category.save()
+            parent = serializer.validated_data.get('parent')
+            if parent and parent.is_descendant_of(category):
+                return Response({'message': 'Category can not be moved '
+                                            'into its subtree'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            changed = update_model(category, serializer.validated_data)
+            if changed:
+                category.save(update_fields=changed)
             serializer = self.serializer_class(category)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -121,8 +172,7 @@ class CategoryBySlugAPIView(APIView):
                                              f'{category_slug} not found'},
                             status=status.HTTP_404_NOT_FOUND)
 
-        category.is_active = False
-        category.save()
+        Category.objects.filter(pk=category.pk).delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def get_permissions(self):
@@ -131,26 +181,94 @@ class CategoryBySlugAPIView(APIView):
         return [permissions.IsAdminUser()]
 
 
-class ProductsAPIView(APIView):
+class CategoryBulkAPIView(APIView):
     """
-    Views to get and create a products
+    View to delete or restore many categories
+    """
+    serializer_class = CategoryBulkSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary='Delete or restore categories',
+        description='View to delete or restore categories by slugs with '
+                    'one UPDATE. Products of deleted categories are '
+                    'deleted too, restored categories do not restore '
+                    'their products',
+        tags=category_tags
+    )
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            data = serializer.validated_data
+
+            if data['action'] == 'delete':
+                rows = (Category.objects.filter(slug__in=data['slugs'])
+                        .delete())
+            else:
+                rows = (Category.objects.unfiltered()
+                        .filter(slug__in=data['slugs'], is_active=False)
+                        .restore())
+            return Response({'updated': rows}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ProductListMixin:
+    """
+    Filtering, keyset pagination and serialization of product lists. With
+    FAST_LIST_SERIALIZATION rows are serialized by ProductListSerializer.
+    Facets are counted when they are asked by the facets parameter
     """
     serializer_class = ProductSerializer
+    list_serializer_class = ProductListSerializer
+    pagination_class = KeysetPagination
+    facets = None
+
+    def get_page(self, request, queryset):
+        product_filter = ProductFilter(request.query_params)
+        if product_filter.data['facets']:
+            self.facets = product_filter.get_facets(
+                list(product_filter.get_facets_queryset(queryset)))
+        queryset = product_filter.filter_queryset(queryset)
+        self.ordering = product_filter.get_ordering(self.ordering)
+
+        if settings.FAST_LIST_SERIALIZATION:
+            queryset = self.list_serializer_class.get_queryset(queryset)
+
+        self.paginator = self.pagination_class()
+        return self.paginator.paginate_queryset(queryset, request, view=self)
+
+    def get_page_response(self, page):
+        if settings.FAST_LIST_SERIALIZATION:
+            serializer = self.list_serializer_class(page)
+        else:
+            serializer = self.serializer_class(page, many=True)
+        data = self.paginator.get_paginated_data(serializer.data)
+        if self.facets is not None:
+            data['facets'] = self.facets
+        return Response(data)
+
+
+class ProductsAPIView(ProductListMixin, APIView):
+    """
+    Views to get and create a products
+    """
+    ordering = ('id',)
 
     @extend_schema(
         summary='Get products',
-        description='View to get all products',
-        tags=products_tags
+        description='View to get all products page by page',
+        tags=products_tags,
+        parameters=pagination_parameters + [ProductFilterSerializer]
     )
     def get(self, request):
-        products = Product.objects.select_related('category').all()
+        products = Product.objects.select_related('category')
+        page = self.get_page(request, products)
 
-        if not products:
+        if not page:
             return Response({'message': 'Products not found'},
                             status=status.HTTP_404_NOT_FOUND)
 
-        serializer = self.serializer_class(products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_page_response(page)
 
     @extend_schema(
         summary='Create a new products',
@@ -160,10 +278,7 @@ class ProductsAPIView(APIView):
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid(raise_exception=True):
-            data = serializer.validated_data
-            category_slug = data.pop('category_slug')
-            category = Category.objects.get(slug=category_slug)
-            product = Product.objects.create(category=category, **data)
+            product = Product.objects.create(**serializer.validated_data)
             serializer = self.serializer_class(product)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -174,6 +289,100 @@ class ProductsAPIView(APIView):
         return [permissions.IsAdminUser()]
 
 
+class ProductSearchAPIView(APIView):
+    """
+    View to search products by name and category
+    """
+    serializer_class = ProductSerializer
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        summary='Search products',
+        description='View to get products matching the query, best '
+                    'matches first',
+        tags=products_tags,
+        parameters=[ProductSearchSerializer]
+    )
+    def get(self, request):
+        query = ProductSearchSerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        product_ids = search_products(query.validated_data['q'],
+                                      query.validated_data['limit'])
+        products = (Product.objects.select_related('category')
+                    .in_bulk(product_ids))
+        products = [products[pk] for pk in product_ids if pk in products]
+
+        serializer = self.serializer_class(products, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ProductImportAPIView(APIView):
+    """
+    View to import products from a CSV or JSON lines file
+    """
+    serializer_class = ProductImportFileSerializer
+    parser_classes = [MultiPartParser]
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary='Import products',
+        description='View to create many products from a CSV or JSON '
+                    'lines file with the fields name, category_slug, '
+                    'price, sale, image1, image2, image3. Rows with '
+                    'errors are skipped and returned in the report',
+        tags=products_tags
+    )
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            data = serializer.validated_data
+            importer = ProductImporter(batch_size=data.get('batch_size'))
+            report = importer.run(read_upload(data['file'],
+                                              data['file_format']))
+            return Response(report, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ProductBulkAPIView(APIView):
+    """
+    View to delete or restore many products
+    """
+    serializer_class = ProductBulkSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary='Delete or restore products',
+        description='View to delete or restore products chosen by slugs, '
+                    'category slug and price with one UPDATE',
+        tags=products_tags
+    )
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            data = serializer.validated_data
+
+            if data['action'] == 'delete':
+                products = Product.objects.all()
+            else:
+                products = Product.objects.unfiltered().filter(
+                    is_active=False)
+
+            if 'slugs' in data:
+                products = products.filter(slug__in=data['slugs'])
+            if 'category_slug' in data:
+                products = products.filter(
+                    category__slug=data['category_slug'])
+            products = ProductFilter(data).filter_queryset(products)
+
+            if data['action'] == 'delete':
+                rows = products.delete()
+            else:
+                rows = products.restore()
+            return Response({'updated': rows}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 class ProductBySlugAPIView(APIView):
     """
     Views to get, update and delete product by slug
@@ -182,7 +391,8 @@ class ProductBySlugAPIView(APIView):
 
     def get_object(self, product_slug):
         try:
-            product = Product.objects.get(slug=product_slug)
+            product = (Product.objects.select_related('category')
+                       .get(slug=product_slug))
             self.check_object_permissions(self.request, product)
             return product
         except Product.DoesNotExist:
@@ -196,15 +406,21 @@ class ProductBySlugAPIView(APIView):
     )
     def get(self, request, *args, **kwargs):
         product_slug = kwargs.get('slug')
-        product = self.get_object(product_slug)
+        key = get_cache_key('product', product_slug,
+                            models=[Category, Product])
+        entry = get_cached(key)
 
-        if not product:
-            return Response({'message': f'Product with slug {product_slug}'
-                                        f' not found'},
-                            status=status.HTTP_404_NOT_FOUND)
+        if not entry:
+            product = self.get_object(product_slug)
 
-        serializer = self.serializer_class(product)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+            if not product:
+                return Response({'message': f'Product with slug '
+                                            f'{product_slug} not found'},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            serializer = self.serializer_class(product)
+            entry = set_cached(key, serializer.data)
+        return cached_response(request, entry)
 
     @extend_schema(
         summary='Update product',
@@ -213,7 +429,19 @@ class ProductBySlugAPIView(APIView):
         operation_id='update_product'
     )
     def put(self, request, *args, **kwargs):
-        product_slug = kwargs.get('slug')
+        return self.update(request, kwargs.get('slug'))
+
+    @extend_schema(
+        summary='Partially update product',
+        description='View to update some fields of a product by slug, '
+                    'only the changed fields are written',
+        tags=products_tags,
+        operation_id='partial_update_product'
+    )
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, kwargs.get('slug'), partial=True)
+
+    def update(self, request, product_slug, partial=False):
         product = self.get_object(product_slug)
 
         if not product:
@@ -221,10 +449,12 @@ class ProductBySlugAPIView(APIView):
                                         f' not found'},
                             status=status.HTTP_404_NOT_FOUND)
 
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(data=request.data,
+                                           partial=partial)
         if serializer.is_valid(raise_exception=True):
-            product = update_model(product, serializer.validated_data)
-            product.save()
+            changed = update_model(product, serializer.validated_data)
+            if changed:
+                product.save(update_fields=changed)
             serializer = self.serializer_class(product)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -245,7 +475,7 @@ class ProductBySlugAPIView(APIView):
                             status=status.HTTP_404_NOT_FOUND)
 
         product.is_active = False
-        product.save()
+        product.save(update_fields=['is_active'])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def get_permissions(self):
@@ -254,26 +484,36 @@ class ProductBySlugAPIView(APIView):
         return [permissions.IsAdminUser()]
 
 
-class ProductByCategoryAPIView(APIView):
+class ProductByCategoryAPIView(ProductListMixin, APIView):
     """
-    View to get all products by category
+    View to get all products of a category and its descendants
     """
-    serializer_class = ProductSerializer
     permission_classes = [permissions.AllowAny]
+    ordering = ('category_id', 'id')
 
     @extend_schema(
         summary='Get products by category',
-        description='View to get all products by category slug',
-        tags=products_tags
+        description='View to get all products of a category and its '
+                    'descendants by category slug page by page',
+        tags=products_tags,
+        parameters=pagination_parameters + [ProductFilterSerializer]
     )
     def get(self, request, *args, **kwargs):
-        category = Category.objects.get(slug=kwargs.get('category_slug'))
-        products = Product.objects.filter(category=category)
+        category_slug = kwargs.get('category_slug')
+        try:
+            category = Category.objects.get(slug=category_slug)
+        except Category.DoesNotExist:
+            return Response({'message': f'Category with slug '
+                                        f'{category_slug} not found'},
+                            status=status.HTTP_404_NOT_FOUND)
 
-        if not products.exists():
+        products = (Product.objects.select_related('category')
+                    .filter(category__in=category.get_descendants()))
+        page = self.get_page(request, products)
+
+        if not page:
             return Response({'message': f'Products with category slug '
                                         f'{category} not found'},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = self.serializer_class(products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_page_response(page)
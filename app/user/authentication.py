@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt import models
+from rest_framework_simplejwt.authentication import (
+    JWTStatelessUserAuthentication
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from app.user.models import User
+
+STATE_KEY = 'user-state:{}'
+USER_CLAIMS = ('is_admin', 'is_staff', 'is_active')
+
+
+def get_user_claims(user):
+    return {claim: getattr(user, claim) for claim in USER_CLAIMS}
+
+
+def get_user_state(user_id):
+    """
+    Returned {claim: value} of USER_CLAIMS from the database, None when
+    the user does not exist. The answer is cached for
+    TOKEN_USER_ACTIVE_CACHE_TIMEOUT seconds and dropped when the user is
+    saved
+    """
+    key = STATE_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        # An empty tuple is cached for a missing user
+        state = (User.objects.filter(pk=user_id)
+                 .values_list(*USER_CLAIMS).first() or ())
+        cache.set(key, state, settings.TOKEN_USER_ACTIVE_CACHE_TIMEOUT)
+    return dict(zip(USER_CLAIMS, state)) if state else None
+
+
+def forget_user_state(user_id):
+    cache.delete(STATE_KEY.format(user_id))
+
+
+class TokenUser(models.TokenUser):
+    """
+    User built from the claims of the access token, so permission checks
+    need no query. Other attributes are taken from the User, which is
+    loaded on first access
+
+    Fields:
+        is_admin (bool): User is admin
+        is_staff (bool): User is staff
+        is_active (bool): User is active
+        instance (User): User from the database
+
+    Methods:
+        get_claim(): Returned the claim or the field of the User for tokens
+            issued without the claim
+    """
+
+    def get_claim(self, name):
+        if name in self.token:
+            return self.token[name]
+        return getattr(self.instance, name)
+
+    @cached_property
+    def instance(self):
+        return User.objects.get(pk=self.id)
+
+    @cached_property
+    def is_admin(self):
+        return self.get_claim('is_admin')
+
+    @cached_property
+    def is_staff(self):
+        return self.get_claim('is_staff')
+
+    @cached_property
+    def is_active(self):
+        return self.get_claim('is_active')
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return self.id == other.pk
+        return super().__eq__(other)
+
+    __hash__ = models.TokenUser.__hash__
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return self.get_claim(attr)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication without the user query on every request. The user
+    is TokenUser, its claims are compared with the cached state of the
+    user, so deactivated and deleted users are rejected and a token of a
+    demoted admin stops working when the user is saved
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        state = get_user_state(user.id)
+        if state is None or not state['is_active']:
+            raise AuthenticationFailed('User is inactive',
+                                       code='user_inactive')
+        # Tokens issued without the claims read them from the User
+        if any(validated_token[claim] != value
+               for claim, value in state.items() if claim in validated_token):
+            raise AuthenticationFailed('Token claims are outdated',
+                                       code='token_claims_outdated')
+        return user
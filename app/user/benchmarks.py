@@ -0,0 +1,34 @@
+from django.contrib.auth.hashers import make_password
+
+from app.user.models import User, Address
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+
+def create_users(users, addresses):
+    """
+    Creates synthetic users with addresses in bulk. All users have the
+    password BENCHMARK_PASSWORD, it is hashed once. Returned created users
+    """
+    password = make_password(BENCHMARK_PASSWORD)
+    user_objs = User.objects.bulk_create([
+        User(email=f'benchmark-{index}@example.com',
+             name=f'Name {index}',
+             surname=f'Surname {index}',
+             phone=f'+7000{index:07d}',
+             password=password)
+        for index in range(users)
+    ], batch_size=1000)
+
+    Address.objects.bulk_create([
+        Address(user=user,
+                city='Moscow',
+                street=f'Benchmark street {number}',
+                house=str(index),
+                apartment=str(number),
+                description='Synthetic address')
+        for index, user in enumerate(user_objs)
+        for number in range(addresses)
+    ], batch_size=1000)
+
+    return user_objs
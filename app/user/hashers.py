@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASHING_WORKERS,
+                              thread_name_prefix='password-hashing')
+slots = BoundedSemaphore(settings.PASSWORD_HASHING_WORKERS
+                         + settings.PASSWORD_HASHING_QUEUE_SIZE)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id with the minimum parameters recommended by OWASP: 19 MiB of
+    memory, 2 iterations and 1 lane, so one hash takes one core
+    """
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many passwords are being hashed, try again later'
+    default_code = 'password_hashing_busy'
+
+
+def submit(func, *args):
+    """
+    Runs func in the password hashing pool and returned its future.
+    Raises PasswordHashingBusy when all threads and queue slots are taken
+    """
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def hash_password(password):
+    """
+    Returned the hash of the password made in the password hashing pool,
+    so a spike of registrations can not take all request threads
+    """
+    return submit(make_password, password).result()
+
+
+def rehash_password(user_id, old_hash, password):
+    """
+    Saves the hash of the password made by the current hasher, when the
+    password of the user was not changed meanwhile
+    """
+    from app.user.models import User
+
+    try:
+        User.objects.filter(pk=user_id, password=old_hash).update(
+            password=make_password(password))
+    finally:
+        connections.close_all()
+
+
+def rehash_password_later(user_id, old_hash, password):
+    """
+    Rehashes the password in the pool, so login does not wait for the
+    second hash. When the pool is busy the password is rehashed on one of
+    the next logins
+    """
+    try:
+        submit(rehash_password, user_id, old_hash, password)
+    except PasswordHashingBusy:
+        pass
@@ -0,0 +1,46 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = ('Measure hashes per second of the preferred hasher of every '
+            'password hasher profile, in one thread and in all cores')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hashes', type=int, default=20,
+                            help='Number of hashes per thread')
+        parser.add_argument('--threads', type=int, default=os.cpu_count())
+
+    def handle(self, *args, **options):
+        for profile, hashers in settings.PASSWORD_HASHER_PROFILES.items():
+            hasher = import_string(hashers[0])()
+            try:
+                hasher.encode('benchmark-password', hasher.salt())
+            except ValueError as error:
+                self.stdout.write(self.style.WARNING(f'{profile}: {error}'))
+                continue
+
+            single = self.measure(hasher, options['hashes'], 1)
+            parallel = self.measure(hasher, options['hashes'],
+                                    options['threads'])
+            current = (' (current)'
+                       if profile == settings.PASSWORD_HASHER_PROFILE else '')
+            self.stdout.write(
+                f'{profile}{current}: {single:.1f} hashes/s per core, '
+                f'{parallel:.1f} hashes/s in {options["threads"]} threads, '
+                f'{1000 / single:.0f} ms per hash')
+
+    def measure(self, hasher, hashes, threads):
+        def run(_):
+            for _ in range(hashes):
+                hasher.encode('benchmark-password', hasher.salt())
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(run, range(threads)))
+        return hashes * threads / (time.perf_counter() - start)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = ('Delete expired outstanding tokens and their blacklist entries '
+            'in batches, run it periodically')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of tokens in one DELETE')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = (OutstandingToken.objects.filter(expires_at__lte=now)
+                   .order_by('id').values_list('id', flat=True))
+
+        total = 0
+        while True:
+            ids = list(expired[:options['batch_size']])
+            if not ids:
+                break
+            with transaction.atomic():
+                OutstandingToken.objects.filter(id__in=ids).delete()
+            total += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {total} expired tokens'))
@@ -1,4 +1,7 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db.models import Prefetch
+
+from app.user.hashers import hash_password
 
 
 class CustomUserManager(BaseUserManager):
@@ -8,18 +11,20 @@ class CustomUserManager(BaseUserManager):
     Methods:
         create_user(): Create a user
         create_superuser(): Create a superuser
+        with_addresses(): Returned users with prefetched active addresses
     """
 
     def create_user(self, email, password, **extra_fields):
         """
-        Create and eturned a user
+        Create and returned a user, the password is hashed in the password
+        hashing pool
         """
         if not email:
             return ValueError('Email is a required field')
 
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        user.password = hash_password(password)
         user.save(using=self._db)
         return user
 
@@ -38,3 +43,12 @@ class CustomUserManager(BaseUserManager):
             return ValueError('Superuser must have is_admin=True')
 
         return self.create_user(email, password, **extra_fields)
+
+    def with_addresses(self):
+        """
+        Returned users with active addresses loaded by one query, the
+        serializers of addresses use the prefetched list
+        """
+        Address = self.model._meta.get_field('address').related_model
+        addresses = Address.objects.order_by('id')
+        return self.prefetch_related(Prefetch('address', queryset=addresses))
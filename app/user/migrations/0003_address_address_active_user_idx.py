@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_alter_address_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'id'], name='address_active_user_idx'),
+        ),
+    ]
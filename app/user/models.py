@@ -1,8 +1,10 @@
 from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.hashers import check_password
 from django.core.validators import validate_email
 from django.db import models
 
 from app.common.models import BaseModel
+from app.user.hashers import rehash_password_later
 from app.user.managers import CustomUserManager
 
 
@@ -22,6 +24,8 @@ class User(AbstractBaseUser, BaseModel):
 
     Methods:
         get_full_name(): Returned user`s full name
+        check_password(): Returned whether the password is correct, hash
+            of an old hasher is updated in the background
         __str__(): Returned user`s full name
     """
 
@@ -41,6 +45,12 @@ class User(AbstractBaseUser, BaseModel):
     def get_full_name(self):
         return f'{self.name} {self.surname}'
 
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            rehash_password_later(self.pk, self.password, raw_password)
+
+        return check_password(raw_password, self.password, setter)
+
     def __str__(self):
         return self.get_full_name()
 
@@ -79,3 +89,9 @@ class Address(BaseModel):
 
     class Meta:
         unique_together = ['user', 'city', 'street', 'house', 'apartment']
+        indexes = [
+            # Active addresses of a user in the order by id
+            models.Index(fields=['user', 'id'],
+                         condition=models.Q(is_active=True),
+                         name='address_active_user_idx')
+        ]
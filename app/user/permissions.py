@@ -3,11 +3,9 @@ from rest_framework.permissions import BasePermission
 
 class IsOwnerOrAdminUser(BasePermission):
     def has_permission(self, request, view):
-        if request.user.is_admin or request.user.is_authenticated:
-            return True
-        return False
+        return bool(request.user and request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
-        if request.user == obj.user or request.user.is_admin:
+        if obj.user_id == request.user.pk or request.user.is_admin:
             return True
         return False
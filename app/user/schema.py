@@ -0,0 +1,9 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """
+    Bearer JWT scheme of StatelessJWTAuthentication in the API schema
+    """
+    target_class = 'app.user.authentication.StatelessJWTAuthentication'
+    name = 'statelessJwtAuth'
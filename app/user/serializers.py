@@ -1,11 +1,19 @@
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (TokenObtainPairSerializer,
+                                                  TokenRefreshSerializer,
+                                                  TokenVerifySerializer)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
+from app.common.serializers import TimedSerializer
+from app.user.authentication import get_user_claims
 from app.user.models import User
+from app.user.tokens import RefreshToken, is_blacklisted
 
 
-class AddressSerializer(serializers.Serializer):
+class AddressSerializer(TimedSerializer):
     city = serializers.CharField(max_length=100)
     street = serializers.CharField(max_length=100)
     house = serializers.CharField(max_length=20)
@@ -15,7 +23,7 @@ class AddressSerializer(serializers.Serializer):
                                          source='get_full_address')
 
 
-class ProfileSerializer(serializers.Serializer):
+class ProfileSerializer(TimedSerializer):
     name = serializers.CharField()
     surname = serializers.CharField()
     email = serializers.EmailField()
@@ -23,23 +31,72 @@ class ProfileSerializer(serializers.Serializer):
     address = AddressSerializer(many=True, read_only=True)
     password = serializers.CharField(write_only=True)
 
+    unique_fields = ('email', 'phone')
+
     def validate_email(self, email):
-        if User.objects.filter(email=email).exists():
-            raise ValidationError('User with this email already exists.')
-        return email
+        return User.objects.normalize_email(email)
+
+    def get_unique_errors(self, instance=None):
+        """
+        Returned errors of the unique fields which values are taken by
+        other users. Uniqueness is checked by the database constraints, so
+        it is called only after IntegrityError
+        """
+        data = self.validated_data
+        fields = [field for field in self.unique_fields if field in data]
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{field: data[field]})
+
+        users = User.objects.filter(condition)
+        if instance is not None:
+            users = users.exclude(pk=instance.pk)
 
-    def validate_phone(self, phone):
-        if User.objects.filter(phone=phone).exists():
-            raise ValidationError('User with this phone already exists.')
-        return phone
+        errors = {}
+        for user in users.values(*fields):
+            for field in fields:
+                if user[field] == data[field]:
+                    errors[field] = [f'User with this {field} '
+                                     f'already exists.']
+        return errors
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
-    Custom serializer to added fields
+    Custom serializer to added fields. Tokens have the claims is_admin,
+    is_staff and is_active for TokenUser
     """
+    token_class = RefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token.payload.update(get_user_claims(user))
+        return token
 
     def validate(self, attrs):
         token = super().validate(attrs)
         token['is_admin'] = self.user.is_admin
         return token
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Serializer to refresh token with the cached blacklist
+    """
+    token_class = RefreshToken
+
+
+class CustomTokenVerifySerializer(TokenVerifySerializer):
+    """
+    Serializer to verify token with the cached blacklist
+    """
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs['token'])
+
+        if api_settings.BLACKLIST_AFTER_ROTATION:
+            if is_blacklisted(token.get(api_settings.JTI_CLAIM)):
+                raise ValidationError('Token is blacklisted')
+
+        return {}
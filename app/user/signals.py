@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from app.common.cache import bump_version
+from app.user.authentication import forget_user_state
+from app.user.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def update_user_state(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_user_state(instance.pk))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+@receiver(post_delete, sender=BlacklistedToken)
+def update_blacklist(sender, **kwargs):
+    bump_version(BlacklistedToken)
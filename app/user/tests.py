@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from app.user import tokens
+from app.user.authentication import get_user_state
+from app.user.models import Address, User
+from app.user.serializers import CustomTokenObtainPairSerializer
+
+
+class ProfileQueryCountTests(TestCase):
+    """
+    The profile is loaded with its active addresses by one prefetch, so
+    the number of queries does not grow with the addresses and deleted
+    addresses are not shown
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='user@example.com', password='password', name='Name',
+            surname='Surname', phone='+10000000000')
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.headers = {
+            'HTTP_AUTHORIZATION': f'Bearer {token.access_token}'
+        }
+        # The cached state of the token user is not counted
+        get_user_state(self.user.pk)
+
+    def create_addresses(self, count):
+        """
+        Creates active addresses and one deleted address, which must not
+        be in the profile
+        """
+        Address.objects.bulk_create([
+            Address(user=self.user, city='City', street='Street',
+                    house=str(index), apartment='1')
+            for index in range(count)
+        ] + [Address(user=self.user, city='City', street='Street',
+                     house='deleted', apartment='1', is_active=False)])
+
+    def assert_profile_queries(self, addresses):
+        self.create_addresses(addresses)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/profile/', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        houses = [address['house']
+                  for address in response.json()['address']]
+        self.assertEqual(houses, [str(index) for index in range(addresses)])
+        self.assertNotIn('deleted', houses)
+
+    def test_without_addresses(self):
+        self.assert_profile_queries(0)
+
+    def test_one_address(self):
+        self.assert_profile_queries(1)
+
+    def test_fifty_addresses(self):
+        self.assert_profile_queries(50)
+
+
+@override_settings(TOKEN_BLACKLIST_CACHE_TIMEOUT=60)
+class BlacklistSnapshotTests(TestCase):
+    """
+    The blacklist of the process is read from the database again when it
+    is old, also when the version bumped by another process is not seen
+    """
+
+    def setUp(self):
+        cache.clear()
+        tokens._blacklist = (None, 0, frozenset())
+        self.addCleanup(setattr, tokens, '_blacklist',
+                        (None, 0, frozenset()))
+        user = User.objects.create_user(
+            email='user@example.com', password='password', name='Name',
+            surname='Surname', phone='+10000000000')
+        self.token = tokens.RefreshToken.for_user(user)
+
+    def test_reloaded_when_old(self):
+        jti = self.token['jti']
+        with mock.patch.object(tokens, 'get_versions', return_value=[1]), \
+                mock.patch.object(tokens.time, 'monotonic') as monotonic:
+            monotonic.return_value = 1000
+            self.assertFalse(tokens.is_blacklisted(jti))
+            self.token.blacklist()
+
+            monotonic.return_value = 1059
+            self.assertFalse(tokens.is_blacklisted(jti))
+            monotonic.return_value = 1060
+            self.assertTrue(tokens.is_blacklisted(jti))
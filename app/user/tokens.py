@@ -0,0 +1,79 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from app.common.cache import get_versions
+from app.user.authentication import get_user_state
+
+BLACKLIST_KEY = 'blacklist:{}'
+
+# Version, load time and JTIs of the blacklist loaded by this process
+_blacklist = (None, 0, frozenset())
+
+
+def load_blacklist():
+    return frozenset(
+        BlacklistedToken.objects
+        .filter(token__expires_at__gt=timezone.now())
+        .values_list('token__jti', flat=True)
+    )
+
+
+def get_blacklist():
+    """
+    Returned JTIs of blacklisted tokens which are not expired. The set is
+    kept in the process and in the cache under the version of
+    BlacklistedToken, which is bumped when a token is blacklisted, so the
+    database is queried once after every change. The version is not seen
+    by other processes when the cache is not shared, so the set of the
+    process is read from the database again when it is older than
+    TOKEN_BLACKLIST_CACHE_TIMEOUT
+    """
+    global _blacklist
+
+    timeout = settings.TOKEN_BLACKLIST_CACHE_TIMEOUT
+    version, = get_versions(BlacklistedToken)
+    loaded_version, loaded_at, jtis = _blacklist
+    now = time.monotonic()
+    if now - loaded_at >= timeout:
+        jtis = load_blacklist()
+        cache.set(BLACKLIST_KEY.format(version), jtis, timeout)
+        _blacklist = (version, now, jtis)
+    elif loaded_version != version:
+        key = BLACKLIST_KEY.format(version)
+        jtis = cache.get(key)
+        if jtis is None:
+            jtis = load_blacklist()
+            cache.set(key, jtis, timeout)
+        _blacklist = (version, now, jtis)
+    return jtis
+
+
+def is_blacklisted(jti):
+    return jti in get_blacklist()
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    Refresh token which is checked against the cached blacklist. Access
+    tokens get the claims of the current state of the user, not the
+    claims of the refresh token, which could be outdated
+    """
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        state = get_user_state(self.payload.get(api_settings.USER_ID_CLAIM))
+        if state is not None:
+            access.payload.update(state)
+        return access
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError('Token is blacklisted')
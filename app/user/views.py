@@ -1,18 +1,22 @@
+from django.db import IntegrityError, transaction
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import (TokenObtainPairView,
                                             TokenVerifyView,
                                             TokenRefreshView)
 
 from app.common.utils import update_model
+from app.user.hashers import hash_password
 from app.user.models import User, Address
 from app.user.permissions import IsOwnerOrAdminUser
 from app.user.serializers import (ProfileSerializer,
                                   AddressSerializer,
-                                  CustomTokenObtainPairSerializer)
+                                  CustomTokenObtainPairSerializer,
+                                  CustomTokenRefreshSerializer,
+                                  CustomTokenVerifySerializer)
 
 profile_tags = ['Profiles']
 address_tags = ['Addresses']
@@ -25,6 +29,7 @@ class ProfileAPIView(APIView):
     """
 
     serializer_class = ProfileSerializer
+    query_budget = 5
 
     @extend_schema(
         summary='Get profile',
@@ -32,7 +37,7 @@ class ProfileAPIView(APIView):
         tags=profile_tags
     )
     def get(self, request):
-        user = User.objects.get(pk=request.user.pk)
+        user = User.objects.with_addresses().get(pk=request.user.pk)
         serializer = self.serializer_class(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -44,14 +49,28 @@ class ProfileAPIView(APIView):
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         if serializer. is_valid(raise_exception=True):
-            user = User.objects.create_user(**serializer.validated_data)
+            data = dict(serializer.validated_data)
+            password = data.pop('password')
+            user = User(**data)
+            # The password is hashed before the transaction, so the write
+            # lock is not held while the hashing pool works
+            user.password = hash_password(password)
+            try:
+                with transaction.atomic():
+                    user.save()
+            except IntegrityError:
+                errors = serializer.get_unique_errors()
+                if not errors:
+                    raise
+                raise ValidationError(errors)
+
             serializer = self.serializer_class(user)
             data = serializer.data
 
-            refresh = RefreshToken.for_user(user)
+            refresh = CustomTokenObtainPairSerializer.get_token(user)
             data.setdefault('refresh', str(refresh))
             data.setdefault('access', str(refresh.access_token))
-            data.setdefault('is_admin', request.user.is_admin)
+            data.setdefault('is_admin', user.is_admin)
             data.pop('address')
 
             return Response(data, status=status.HTTP_201_CREATED)
@@ -63,11 +82,38 @@ class ProfileAPIView(APIView):
         tags=profile_tags
     )
     def put(self, request):
-        user = request.user
-        serializer = self.serializer_class(data=request.data)
+        return self.update(request)
+
+    @extend_schema(
+        summary='Partially update profile',
+        description='View to update some fields of profile, only the '
+                    'changed fields are written',
+        tags=profile_tags
+    )
+    def patch(self, request):
+        return self.update(request, partial=True)
+
+    def update(self, request, partial=False):
+        user = User.objects.with_addresses().get(pk=request.user.pk)
+        serializer = self.serializer_class(data=request.data,
+                                           partial=partial)
         if serializer.is_valid():
-            user = update_model(user, serializer.validated_data)
-            user.save()
+            data = dict(serializer.validated_data)
+            password = data.pop('password', None)
+            changed = update_model(user, data)
+            if password is not None and not user.check_password(password):
+                user.password = hash_password(password)
+                changed.append('password')
+
+            try:
+                if changed:
+                    with transaction.atomic():
+                        user.save(update_fields=changed)
+            except IntegrityError:
+                errors = serializer.get_unique_errors(instance=user)
+                if not errors:
+                    raise
+                raise ValidationError(errors)
             serializer = self.serializer_class(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -78,13 +124,13 @@ class ProfileAPIView(APIView):
         tags=profile_tags
     )
     def delete(self, request):
-        user = request.user
+        user = request.user.instance
         user.is_active = False
         user.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def get_permissions(self):
-        if self.request.method in ['GET', 'UPDATE', 'DELETE']:
+        if self.request.method in ['GET', 'PUT', 'PATCH', 'DELETE']:
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
 
@@ -103,7 +149,7 @@ class AddressAPIView(APIView):
         tags=address_tags
     )
     def get(self, request):
-        addresses = Address.objects.filter(user=request.user)
+        addresses = Address.objects.filter(user_id=request.user.pk)
 
         if not addresses:
             return Response({'message': 'Addresses not found'},
@@ -121,11 +167,11 @@ class AddressAPIView(APIView):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid(raise_exception=True):
 
-            if Address.objects.filter(user=request.user,
+            if Address.objects.filter(user_id=request.user.pk,
                                       **serializer.validated_data).exists():
                 return Response({'message': 'You already have this address'})
 
-            address = Address.objects.create(user=request.user,
+            address = Address.objects.create(user_id=request.user.pk,
                                              **serializer.validated_data)
             serializer = self.serializer_class(address)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -170,16 +216,31 @@ class AddressByIdAPIView(APIView):
         operation_id='update_address'
     )
     def put(self, request, *args, **kwargs):
-        address = self.get_object(kwargs.get('pk'))
+        return self.update(request, kwargs.get('pk'))
+
+    @extend_schema(
+        summary='Partially update address',
+        description='View to update some fields of address by pk, only '
+                    'the changed fields are written',
+        tags=address_tags,
+        operation_id='partial_update_address'
+    )
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, kwargs.get('pk'), partial=True)
+
+    def update(self, request, pk, partial=False):
+        address = self.get_object(pk)
 
         if not address:
             return Response({'message': 'Addresses not found'},
                             status=status.HTTP_404_NOT_FOUND)
 
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(data=request.data,
+                                           partial=partial)
         if serializer.is_valid(raise_exception=True):
-            address = update_model(address, serializer.validated_data)
-            address.save()
+            changed = update_model(address, serializer.validated_data)
+            if changed:
+                address.save(update_fields=changed)
             serializer = self.serializer_class(address)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -198,7 +259,7 @@ class AddressByIdAPIView(APIView):
                             status=status.HTTP_404_NOT_FOUND)
 
         address.is_active = False
-        address.save()
+        address.save(update_fields=['is_active'])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -221,6 +282,7 @@ class CustomTokenRefreshView(TokenRefreshView):
     """
     Custom TokenRefreshView for description methods
     """
+    serializer_class = CustomTokenRefreshSerializer
 
     @extend_schema(
         summary='Refresh token',
@@ -235,6 +297,7 @@ class CustomTokenVerifyView(TokenVerifyView):
     """
     Custom TokenVerifyView for description methods
     """
+    serializer_class = CustomTokenVerifySerializer
 
     @extend_schema(
         summary='Verify token',
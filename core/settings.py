@@ -47,9 +47,12 @@ INSTALLED_APPS = [
     'app.user.apps.UserConfig',
     'app.common.apps.CommonConfig',
     'app.product.apps.ProductConfig',
+    'app.cart.apps.CartConfig',
+    'app.order.apps.OrderConfig',
 ]
 
 MIDDLEWARE = [
+    'app.common.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,10 +90,39 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # WAL lets readers work during a write, IMMEDIATE transactions
+        # take the write lock at BEGIN, so concurrent writers wait for it
+        # up to timeout seconds instead of failing on lock upgrade
+        'OPTIONS': {
+            'init_command': ('PRAGMA journal_mode=WAL;'
+                             'PRAGMA synchronous=NORMAL;'),
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        # An in-memory test database can not be shared by threads in WAL,
+        # the concurrent reservation tests need a file
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Use Redis or memcached in production so that all workers share
+# the cached responses and versions
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'party-cart',
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -109,6 +141,34 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hasher profiles, the first hasher of the profile hashes new
+# passwords and the others verify old hashes, which are rehashed on login.
+# The argon2 profile requires argon2-cffi
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+        'app.user.hashers.Argon2PasswordHasher',
+    ],
+    'scrypt': [
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'app.user.hashers.Argon2PasswordHasher',
+    ],
+    'argon2': [
+        'app.user.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    ],
+}
+PASSWORD_HASHER_PROFILE = 'argon2'
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+# Threads which hash passwords of new users and rehash passwords on login,
+# and the number of passwords which can wait for a thread
+PASSWORD_HASHING_WORKERS = 4
+PASSWORD_HASHING_QUEUE_SIZE = 16
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -129,6 +189,84 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
 
+# Media files are stored under the hash of their content. In production
+# the default backend can be any storage with ContentAddressedMixin, for
+# example an S3 storage, and MEDIA_URL the address of a CDN
+STORAGES = {
+    'default': {
+        'BACKEND': 'app.common.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Uploads are streamed to a temporary file instead of memory
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Cache headers of MediaView, content addressed files never change and
+# other files are cached for MEDIA_CACHE_TIMEOUT seconds
+MEDIA_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+MEDIA_CACHE_TIMEOUT = 60 * 60
+
+# Internal location of MEDIA_ROOT in nginx, for example '/protected-media/'.
+# When it is set MediaView answers with X-Accel-Redirect and nginx sends
+# the file
+MEDIA_ACCEL_REDIRECT = None
+
+# Variants of product images made by the image worker: a square
+# thumbnail and images of the widths, in every format Pillow can write
+PRODUCT_IMAGE_THUMBNAIL_SIZE = 160
+PRODUCT_IMAGE_WIDTHS = [320, 640, 1280]
+PRODUCT_IMAGE_FORMATS = {
+    'webp': {'quality': 80, 'method': 4},
+    'avif': {'quality': 60, 'speed': 6},
+}
+PRODUCT_IMAGE_QUEUE_SIZE = 1000
+
+# Bounds of the price and sale facets of product lists, the last range
+# is open
+PRODUCT_PRICE_FACETS = [0, 10, 50, 100, 500, 1000]
+PRODUCT_SALE_FACETS = [0, 1, 25, 50]
+
+# Seconds a reservation of the cart items holds the stock before
+# sweep_reservations returns it
+STOCK_RESERVATION_TTL = 15 * 60
+
+# Serialize product lists from .values() rows, see ProductListSerializer
+FAST_LIST_SERIALIZATION = True
+
+# Text search configuration of the PostgreSQL search index
+SEARCH_CONFIG = 'simple'
+
+# Number of products in one INSERT of the bulk import
+IMPORT_BATCH_SIZE = 1000
+
+# Maximum number of queries of one request, a view can override it with
+# the attribute query_budget. With QUERY_BUDGET_STRICT a request over the
+# budget raises QueryBudgetExceeded instead of a warning
+QUERY_BUDGET = 30
+QUERY_BUDGET_STRICT = False
+
+# Request metrics of QueryInstrumentationMiddleware are logged to console
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'app.common.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -139,7 +277,18 @@ AUTH_USER_MODEL = 'user.User'
 # Django rest framework settings
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_AUTHENTICATION_CLASSES': ('rest_framework_simplejwt.authentication.JWTAuthentication',)
+    'DEFAULT_AUTHENTICATION_CLASSES': ('app.user.authentication.StatelessJWTAuthentication',),
+    'DEFAULT_RENDERER_CLASSES': (
+        'app.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'app.common.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'app.common.pagination.KeysetPagination',
+    'PAGE_SIZE': 20
 }
 
 # Drf simple jwt settings
@@ -149,8 +298,16 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": False,
     "UPDATE_LAST_LOGIN": False,
+    "TOKEN_USER_CLASS": "app.user.authentication.TokenUser",
 }
 
+# Seconds to cache whether a token user is active, admin and staff
+TOKEN_USER_ACTIVE_CACHE_TIMEOUT = 60
+
+# Seconds to cache the set of blacklisted tokens, a token blacklisted by
+# another process is rejected at the latest after this time
+TOKEN_BLACKLIST_CACHE_TIMEOUT = 60
+
 # Drf spectacular settings
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Party cart',
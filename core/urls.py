@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import (SpectacularAPIView,
                                    SpectacularSwaggerView,
                                    SpectacularRedocView)
 
+from app.common.views import MediaView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/schema/',
@@ -16,5 +19,17 @@ urlpatterns = [
          SpectacularRedocView.as_view(url_name='schema'),
          name='redoc'),
     path('api/', include('app.user.urls')),
-    path('api/', include('app.product.urls'))
+    path('api/', include('app.product.urls')),
+    path('api/', include('app.cart.urls')),
+    path('api/', include('app.order.urls')),
+    path('api/async/', include('app.product.async_urls'))
 ]
+
+# Media is served by the application when MEDIA_URL is local, a CDN in
+# front of it caches files by the Cache-Control headers
+if settings.MEDIA_URL.startswith('/'):
+    urlpatterns.append(
+        path(f'{settings.MEDIA_URL.strip("/")}/<path:path>',
+             MediaView.as_view(),
+             name='media')
+    )